@@ -0,0 +1,378 @@
+# =================================================
+# CORSO DI ALGORIMI E STRUTTURE DATI
+# Benchmark degli ordinamenti (Lezioni 2 e 3)
+# =================================================
+# ALGORIMS AND DATA STRUCTURES COURSE
+# Sorting benchmarks (Lessons 2 and 3)
+# =================================================
+# Prof. Andrea Cigliano
+# =================================================
+#
+# Uso (esempi):
+#   python "SDAL - Benchmark Ordinamenti - Algoritmi e Strutture Dati.py"
+#   python "SDAL - Benchmark Ordinamenti - ..." --sizes 1e2 1e3 1e4 1e5 1e6 1e7 \
+#          --json risultati.json --csv risultati.csv
+#   python "SDAL - Benchmark Ordinamenti - ..." --baseline baseline.json
+# Con --baseline il programma termina con codice 1 se trova regressioni.
+
+import argparse
+import csv
+import importlib.util
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from concurrent.futures.process import BrokenProcessPool
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_lesson(number):
+    """
+    Carica il file di una lezione come modulo (i nomi contengono spazi,
+    quindi non si possono importare con 'import').
+    """
+    path = os.path.join(HERE, f"SDAL - Lezione {number} - Algoritmi e Strutture Dati.py")
+    name = f"sdal_lezione_{number}"
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    # pickle serializza le funzioni dei worker (parallel_merge_sort) per nome
+    # di modulo: il nome deve risolversi qui. I worker non possono importarlo,
+    # lo ereditano solo con un fork (vedi _fork_context nella Lezione 3).
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+# ============================================================
+# 1) DISTRIBUZIONI DI INPUT
+# ============================================================
+def make_input(distribution, n, seed=0):
+    """
+    Genera n interi con la distribuzione richiesta (riproducibile con seed):
+    random, sorted, reversed, few_unique, organ_pipe, sawtooth.
+    """
+    rng = random.Random(f"{distribution}-{n}-{seed}")
+    if distribution == "random":
+        return [rng.randrange(10 * n) for _ in range(n)]
+    if distribution == "sorted":
+        return list(range(n))
+    if distribution == "reversed":
+        return list(range(n, 0, -1))
+    if distribution == "few_unique":
+        return [rng.randrange(8) for _ in range(n)]
+    if distribution == "organ_pipe":
+        half = n // 2
+        return list(range(half)) + list(range(n - half, 0, -1))
+    if distribution == "sawtooth":
+        tooth = max(n // 16, 1)
+        return [i % tooth for i in range(n)]
+    raise ValueError(f"distribuzione sconosciuta: {distribution}")
+
+
+DISTRIBUTIONS = ("random", "sorted", "reversed", "few_unique", "organ_pipe", "sawtooth")
+
+
+# ============================================================
+# 2) CONTATORI DI OPERAZIONI
+# ============================================================
+class Counters:
+    """ Contatori globali azzerati prima di ogni misura. """
+    comparisons = 0
+    writes = 0
+
+    @classmethod
+    def reset(cls):
+        cls.comparisons = 0
+        cls.writes = 0
+
+
+class CountingValue:
+    """ Avvolge un valore e conta ogni confronto eseguito su di esso. """
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        Counters.comparisons += 1
+        return self.value < other.value
+
+    def __le__(self, other):
+        Counters.comparisons += 1
+        return self.value <= other.value
+
+    def __gt__(self, other):
+        Counters.comparisons += 1
+        return self.value > other.value
+
+    def __ge__(self, other):
+        Counters.comparisons += 1
+        return self.value >= other.value
+
+    def __eq__(self, other):
+        Counters.comparisons += 1
+        return self.value == other.value
+
+    def __ne__(self, other):
+        Counters.comparisons += 1
+        return self.value != other.value
+
+    __hash__ = None
+
+
+class CountingList(list):
+    """
+    Lista che conta le scritture sui propri elementi (uno scambio = 2 scritture).
+    Conta solo gli spostamenti nell'array di input: gli algoritmi che lavorano
+    su liste nuove (quick_sort, merge_sort di riferimento) risultano a 0.
+    """
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            Counters.writes += len(range(*index.indices(len(self))))
+        else:
+            Counters.writes += 1
+        super().__setitem__(index, value)
+
+
+# ============================================================
+# 3) ALGORITMI SOTTO MISURA
+# ============================================================
+# (nome, lezione, funzione, classe di complessità, contatori applicabili)
+ALGORITHMS = (
+    ("selection_sort", 2, "selection_sort", "quadratic", True),
+    ("insertion_sort", 2, "insertion_sort", "quadratic", True),
+    ("bubble_sort", 2, "bubble_sort", "quadratic", True),
+    ("quick_sort", 2, "quick_sort", "nlogn", True),
+    ("intro_sort", 2, "intro_sort", "nlogn", True),
+    ("radix_sort_lsd", 2, "radix_sort_lsd", "linear", False),
+    ("merge_sort", 3, "merge_sort", "nlogn", True),
+    ("natural_merge_sort", 3, "natural_merge_sort", "nlogn", True),
+    ("merge_sort_inplace", 3, "merge_sort_inplace", "nlogn", True),
+    ("parallel_merge_sort", 3, "parallel_merge_sort", "nlogn", False),
+    ("heap_sort", 3, "heap_sort", "nlogn", True),
+    ("heap_sort_dary", 3, "heap_sort_dary", "nlogn", True),
+)
+DEFAULT_ALGORITHMS = ("selection_sort", "insertion_sort", "bubble_sort",
+                      "quick_sort", "merge_sort", "heap_sort")
+
+
+def resolve_algorithms(names):
+    """ Ritorna {nome: (funzione, classe, contatori)} caricando le lezioni necessarie. """
+    lessons = {}
+    table = {}
+    by_name = {a[0]: a for a in ALGORITHMS}
+    for name in names:
+        if name not in by_name:
+            raise ValueError(f"algoritmo sconosciuto: {name}")
+        _, lesson, fn_name, kind, counters = by_name[name]
+        if lesson not in lessons:
+            lessons[lesson] = load_lesson(lesson)
+        table[name] = (getattr(lessons[lesson], fn_name), kind, counters)
+    return table
+
+
+# ============================================================
+# 4) ESECUZIONE DI UN CASO
+# ============================================================
+def run_case(fn, data, repeat, measure_memory, count_ops):
+    """
+    Misura fn su una copia di data:
+    - seconds: miglior tempo su 'repeat' esecuzioni (senza strumentazione),
+    - peak_kib: picco di memoria allocata (tracemalloc, esecuzione separata),
+    - comparisons / writes: con CountingValue e CountingList (esecuzione separata).
+    Verifica anche che il risultato sia ordinato.
+    """
+    expected = sorted(data)
+    record = {"seconds": None, "peak_kib": None, "comparisons": None, "writes": None}
+
+    best = float("inf")
+    for _ in range(repeat):
+        a = data.copy()
+        t0 = time.perf_counter()
+        out = fn(a)
+        best = min(best, time.perf_counter() - t0)
+        if out != expected:
+            raise AssertionError("risultato non ordinato")
+    record["seconds"] = best
+
+    if measure_memory:
+        a = data.copy()
+        tracemalloc.start()
+        try:
+            fn(a)
+            record["peak_kib"] = tracemalloc.get_traced_memory()[1] / 1024
+        finally:
+            tracemalloc.stop()
+
+    if count_ops:
+        a = CountingList(CountingValue(x) for x in data)
+        Counters.reset()
+        fn(a)
+        record["comparisons"] = Counters.comparisons
+        record["writes"] = Counters.writes
+    return record
+
+
+def run_suite(algorithms, distributions, sizes, repeat=3, seed=0,
+              quadratic_max_n=10_000, count_max_n=100_000, measure_memory=True,
+              log=None):
+    """
+    Esegue la matrice algoritmi x distribuzioni x dimensioni e ritorna i record.
+    Gli algoritmi O(n^2) oltre quadratic_max_n vengono saltati (status "skipped");
+    i contatori si calcolano solo fino a count_max_n (sono lenti).
+    Un'eccezione (es. RecursionError di quick_sort, BrokenProcessPool dei
+    worker paralleli) viene registrata come status.
+    """
+    table = resolve_algorithms(algorithms)
+    results = []
+    for n in sizes:
+        for dist in distributions:
+            data = make_input(dist, n, seed)
+            for name in algorithms:
+                fn, kind, counters = table[name]
+                record = {"algorithm": name, "distribution": dist, "n": n,
+                          "status": "ok"}
+                if kind == "quadratic" and n > quadratic_max_n:
+                    record["status"] = "skipped"
+                else:
+                    try:
+                        record.update(run_case(fn, data, repeat, measure_memory,
+                                               counters and n <= count_max_n))
+                    except (RecursionError, MemoryError, AssertionError,
+                            BrokenProcessPool) as exc:
+                        record["status"] = type(exc).__name__
+                results.append(record)
+                if log:
+                    log(record)
+    _add_parallel_speedup(results)
+    return results
+
+
+def _add_parallel_speedup(results):
+    """ Speedup di parallel_merge_sort rispetto a merge_sort_inplace (stesso caso). """
+    serial = {(r["distribution"], r["n"]): r["seconds"] for r in results
+              if r["algorithm"] == "merge_sort_inplace" and r.get("seconds")}
+    for r in results:
+        if r["algorithm"] == "parallel_merge_sort" and r.get("seconds"):
+            base = serial.get((r["distribution"], r["n"]))
+            if base:
+                r["speedup"] = base / r["seconds"]
+
+
+# ============================================================
+# 5) OUTPUT (JSON / CSV) E CONFRONTO CON UNA BASELINE
+# ============================================================
+FIELDS = ("algorithm", "distribution", "n", "status", "seconds", "peak_kib",
+          "comparisons", "writes", "speedup")
+
+
+def write_json(results, path, seed):
+    meta = {"python": platform.python_version(), "platform": platform.platform(),
+            "cpu_count": os.cpu_count(), "seed": seed}
+    with open(path, "w") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2)
+
+
+def write_csv(results, path):
+    with open(path, "w", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=FIELDS, extrasaction="ignore")
+        w.writeheader()
+        for r in results:
+            w.writerow(r)
+
+
+def compare_with_baseline(results, baseline_path, tolerance=0.25, min_delta=0.005):
+    """
+    Confronta con una baseline salvata con --json. Una regressione è:
+    - tempo oltre baseline * (1 + tolerance) e più lento di almeno min_delta
+      secondi (sui casi da pochi millisecondi il rumore supera il 25%),
+    - più confronti o più scritture (contatori deterministici),
+    - un caso che prima passava e ora fallisce.
+    Ritorna la lista delle regressioni (stringhe).
+    """
+    with open(baseline_path) as f:
+        baseline = {(r["algorithm"], r["distribution"], r["n"]): r
+                    for r in json.load(f)["results"]}
+
+    regressions = []
+    for r in results:
+        old = baseline.get((r["algorithm"], r["distribution"], r["n"]))
+        if old is None or old["status"] != "ok":
+            continue
+        case = f'{r["algorithm"]} {r["distribution"]} n={r["n"]}'
+        if r["status"] != "ok":
+            regressions.append(f"{case}: {r['status']}")
+            continue
+        if old.get("seconds") and r["seconds"] > old["seconds"] * (1 + tolerance) \
+                and r["seconds"] - old["seconds"] >= min_delta:
+            regressions.append(f"{case}: {old['seconds']:.4f}s -> {r['seconds']:.4f}s")
+        for counter in ("comparisons", "writes"):
+            if old.get(counter) is not None and r.get(counter) is not None \
+                    and r[counter] > old[counter]:
+                regressions.append(f"{case}: {counter} {old[counter]} -> {r[counter]}")
+    return regressions
+
+
+def _print_record(r):
+    if r["status"] != "ok":
+        print(f'{r["algorithm"]:>20} {r["distribution"]:>11} n={r["n"]:<9} {r["status"]}')
+        return
+    extra = ""
+    if r.get("comparisons") is not None:
+        extra += f' cmp={r["comparisons"]} wr={r["writes"]}'
+    if r.get("peak_kib") is not None:
+        extra += f' mem={r["peak_kib"]:.0f}KiB'
+    print(f'{r["algorithm"]:>20} {r["distribution"]:>11} n={r["n"]:<9} '
+          f'{r["seconds"]:.4f}s{extra}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark degli ordinamenti (Lezioni 2-3)")
+    parser.add_argument("--sizes", nargs="+", default=["1e2", "1e3", "1e4", "1e5"],
+                        help="dimensioni (es. 1e2 ... 1e7)")
+    parser.add_argument("--distributions", nargs="+", default=list(DISTRIBUTIONS),
+                        choices=DISTRIBUTIONS)
+    parser.add_argument("--algorithms", nargs="+", default=list(DEFAULT_ALGORITHMS),
+                        choices=[a[0] for a in ALGORITHMS])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--quadratic-max-n", type=int, default=10_000)
+    parser.add_argument("--count-max-n", type=int, default=100_000)
+    parser.add_argument("--no-memory", action="store_true", help="salta tracemalloc")
+    parser.add_argument("--json", help="salva i risultati in JSON (utilizzabile come baseline)")
+    parser.add_argument("--csv", help="salva i risultati in CSV")
+    parser.add_argument("--baseline", help="JSON di riferimento per il controllo regressioni")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="rallentamento relativo tollerato rispetto alla baseline")
+    parser.add_argument("--min-delta", type=float, default=0.005,
+                        help="rallentamento assoluto minimo (secondi) per una regressione")
+    args = parser.parse_args(argv)
+
+    sizes = [int(float(s)) for s in args.sizes]
+    results = run_suite(args.algorithms, args.distributions, sizes,
+                        repeat=args.repeat, seed=args.seed,
+                        quadratic_max_n=args.quadratic_max_n,
+                        count_max_n=args.count_max_n,
+                        measure_memory=not args.no_memory, log=_print_record)
+
+    if args.json:
+        write_json(results, args.json, args.seed)
+    if args.csv:
+        write_csv(results, args.csv)
+    if args.baseline:
+        regressions = compare_with_baseline(results, args.baseline, args.tolerance,
+                                            args.min_delta)
+        for line in regressions:
+            print("REGRESSIONE:", line)
+        if regressions:
+            return 1
+        print("Nessuna regressione rispetto alla baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,6 +8,10 @@
 # Prof. Andrea Cigliano
 # =================================================
 
+import heapq
+import math
+from array import array
+
 
 # =========================
 # 1. SELECTION SORT
@@ -94,6 +98,457 @@ def quick_sort(arr):
     return quick_sort(left) + middle + quick_sort(right)
 
 
+# =========================
+# 5. INTROSORT (quick sort in-place)
+# =========================
+# Sotto questa soglia gli intervalli vengono ordinati con insertion sort
+INSERTION_SORT_CUTOFF = 16
+# Sopra questa soglia il pivot si sceglie con il "ninther" di Tukey
+NINTHER_THRESHOLD = 128
+
+
+def _insertion_sort_range(arr, lo, hi):
+    """ Insertion sort sul solo intervallo arr[lo:hi] (in-place). """
+    for i in range(lo + 1, hi):
+        key = arr[i]
+        j = i - 1
+        while j >= lo and arr[j] > key:
+            arr[j+1] = arr[j]
+            j -= 1
+        arr[j+1] = key
+
+
+def _median_of_three(arr, a, b, c):
+    """ Ritorna l'indice (tra a, b, c) dell'elemento mediano. """
+    if arr[a] < arr[b]:
+        if arr[b] < arr[c]:
+            return b
+        return c if arr[a] < arr[c] else a
+    if arr[a] < arr[c]:
+        return a
+    return c if arr[b] < arr[c] else b
+
+
+def _choose_pivot(arr, lo, hi):
+    """
+    Sceglie l'indice del pivot in arr[lo:hi]:
+    - mediano di tre (primo, centrale, ultimo) per intervalli piccoli,
+    - "ninther" (mediano di tre mediani di tre) per intervalli grandi.
+    """
+    mid = (lo + hi) // 2
+    last = hi - 1
+    if hi - lo > NINTHER_THRESHOLD:
+        s = (hi - lo) // 8
+        a = _median_of_three(arr, lo, lo + s, lo + 2 * s)
+        b = _median_of_three(arr, mid - s, mid, mid + s)
+        c = _median_of_three(arr, last - 2 * s, last - s, last)
+        return _median_of_three(arr, a, b, c)
+    return _median_of_three(arr, lo, mid, last)
+
+
+def _hoare_partition(arr, lo, hi):
+    """
+    Partizione di Hoare su arr[lo:hi] con pivot = arr[lo].
+    Ritorna j tale che arr[lo..j] <= pivot <= arr[j+1..hi-1],
+    con lo <= j < hi - 1 (entrambe le parti non vuote).
+    Un'unica scansione, scambi solo tra elementi fuori posto.
+    """
+    pivot = arr[lo]
+    i = lo - 1
+    j = hi
+    while True:
+        i += 1
+        while arr[i] < pivot:
+            i += 1
+        j -= 1
+        while arr[j] > pivot:
+            j -= 1
+        if i >= j:
+            return j
+        arr[i], arr[j] = arr[j], arr[i]
+
+
+def _heapify_range(arr, lo, n, i):
+    """
+    Come heapify della Lezione 3, ma iterativa e sul sotto-array arr[lo:lo+n]:
+    i è l'indice relativo (0..n-1) della radice del sottoalbero.
+    """
+    while True:
+        largest = i
+        left = 2 * i + 1
+        right = 2 * i + 2
+        if left < n and arr[lo + left] > arr[lo + largest]:
+            largest = left
+        if right < n and arr[lo + right] > arr[lo + largest]:
+            largest = right
+        if largest == i:
+            return
+        arr[lo + i], arr[lo + largest] = arr[lo + largest], arr[lo + i]
+        i = largest
+
+
+def _heap_sort_range(arr, lo, hi):
+    """ Heap sort (Lezione 3) applicato al solo intervallo arr[lo:hi]. """
+    n = hi - lo
+    for i in range(n // 2 - 1, -1, -1):
+        _heapify_range(arr, lo, n, i)
+    for i in range(n - 1, 0, -1):
+        arr[lo + i], arr[lo] = arr[lo], arr[lo + i]
+        _heapify_range(arr, lo, i, 0)
+
+
+def intro_sort(arr):
+    """
+    Introsort: quick sort in-place con le protezioni di un ordinamento "industriale".
+    - pivot con mediano di tre / ninther, partizione di Hoare (una sola scansione),
+    - insertion sort per gli intervalli con al più INSERTION_SORT_CUTOFF elementi,
+    - se la profondità supera 2*log2(n) l'intervallo passa a heap sort,
+      quindi il caso peggiore resta O(n log n) anche su input avversari.
+    Nessuna lista ausiliaria e nessuna ricorsione: si usa uno stack esplicito,
+    in cui si impila sempre la parte più grande (altezza dello stack O(log n)).
+    Complessità: O(n log n) nel caso peggiore, Spazio: O(log n).
+    quick_sort resta l'implementazione di riferimento.
+    """
+    _intro_sort_range(arr, 0, len(arr))
+    return arr
+
+
+def _intro_sort_range(arr, lo, hi):
+    """ Introsort del solo intervallo arr[lo:hi] (in-place). """
+    if hi - lo < 2:
+        return
+
+    stack = [(lo, hi, 2 * int(math.log2(hi - lo)))]
+    while stack:
+        lo, hi, depth = stack.pop()
+        while True:
+            if hi - lo <= INSERTION_SORT_CUTOFF:
+                _insertion_sort_range(arr, lo, hi)
+                break
+            if depth == 0:
+                # troppi partizionamenti sbilanciati: fallback su heap sort
+                _heap_sort_range(arr, lo, hi)
+                break
+            depth -= 1
+
+            p = _choose_pivot(arr, lo, hi)
+            arr[lo], arr[p] = arr[p], arr[lo]  # pivot in testa per Hoare
+            j = _hoare_partition(arr, lo, hi)
+
+            # impila la parte più grande e prosegui sulla più piccola
+            if j + 1 - lo < hi - (j + 1):
+                stack.append((j + 1, hi, depth))
+                hi = j + 1
+            else:
+                stack.append((lo, j + 1, depth))
+                lo = j + 1
+
+
+# =========================
+# 5.1 SELEZIONE: nth_element / partial_sort / top_k
+# =========================
+def _median_of_medians(arr, lo, hi):
+    """
+    Pivot "mediano dei mediani" (BFPRT) per arr[lo:hi]:
+    ordina gruppi da 5, sposta i mediani in testa e ne seleziona il mediano.
+    Garantisce partizioni bilanciate (almeno ~30% per lato). Ritorna l'indice.
+    """
+    if hi - lo <= 5:
+        _insertion_sort_range(arr, lo, hi)
+        return lo + (hi - lo - 1) // 2
+    m = lo
+    for g in range(lo, hi, 5):
+        end = min(g + 5, hi)
+        _insertion_sort_range(arr, g, end)
+        med = g + (end - g - 1) // 2
+        arr[m], arr[med] = arr[med], arr[m]
+        m += 1
+    mid = lo + (m - lo - 1) // 2
+    _introselect(arr, lo, m, mid)
+    return mid
+
+
+def _introselect(arr, lo, hi, k):
+    """
+    Introselect: porta in arr[k] l'elemento di rango k di arr[lo:hi], con
+    arr[lo:k] <= arr[k] <= arr[k+1:hi]. Come intro_sort (pivot + Hoare) ma
+    prosegue solo nella parte che contiene k; se la profondità supera 2*log2(n)
+    il pivot passa al mediano dei mediani, quindi O(n) anche nel caso peggiore.
+    """
+    depth = 2 * int(math.log2(hi - lo)) if hi - lo > 1 else 0
+    while hi - lo > INSERTION_SORT_CUTOFF:
+        if depth == 0:
+            p = _median_of_medians(arr, lo, hi)
+        else:
+            depth -= 1
+            p = _choose_pivot(arr, lo, hi)
+        arr[lo], arr[p] = arr[p], arr[lo]
+        j = _hoare_partition(arr, lo, hi)
+        if k <= j:
+            hi = j + 1
+        else:
+            lo = j + 1
+    _insertion_sort_range(arr, lo, hi)
+
+
+def nth_element(arr, k):
+    """
+    Selezione in-place: riordina arr in modo che arr[k] sia l'elemento che
+    avrebbe in un array ordinato, con arr[:k] <= arr[k] <= arr[k+1:].
+    Ritorna arr[k] (es. k = len(arr) // 2 per il mediano).
+    Complessità: O(n) media e caso peggiore (introselect).
+    """
+    n = len(arr)
+    if not 0 <= k < n:
+        raise IndexError("k fuori dall'intervallo")
+    _introselect(arr, 0, n, k)
+    return arr[k]
+
+
+def nth_elements(arr, ks):
+    """
+    Selezione multipla in-place (es. batch di percentili) in un'unica passata:
+    seleziona il k centrale, poi prosegue a sinistra con i k minori e a destra
+    con i k maggiori, su intervalli sempre più piccoli.
+    Ritorna la lista dei valori arr[k] nell'ordine di ks.
+    Complessità: O(n log m), m = numero di k distinti.
+    """
+    n = len(arr)
+    for k in ks:
+        if not 0 <= k < n:
+            raise IndexError("k fuori dall'intervallo")
+
+    stack = [(0, n, sorted(set(ks)))]
+    while stack:
+        lo, hi, group = stack.pop()
+        if not group:
+            continue
+        mid = len(group) // 2
+        k = group[mid]
+        _introselect(arr, lo, hi, k)
+        stack.append((lo, k, group[:mid]))
+        stack.append((k + 1, hi, group[mid + 1:]))
+    return [arr[k] for k in ks]
+
+
+def partial_sort(arr, k):
+    """
+    Ordinamento parziale in-place: arr[:k] contiene i k elementi minori, ordinati;
+    il resto di arr è in ordine qualsiasi. Ritorna arr.
+    Complessità: O(n + k log k) (introselect + introsort dei primi k).
+    """
+    n = len(arr)
+    k = max(0, min(k, n))
+    if k == 0:
+        return arr
+    if k < n:
+        _introselect(arr, 0, n, k - 1)
+    _intro_sort_range(arr, 0, k)
+    return arr
+
+
+class _Reversed:
+    """ Inverte l'ordine di una chiave: un min-heap di _Reversed è un max-heap. """
+    __slots__ = ("key",)
+
+    def __init__(self, key):
+        self.key = key
+
+    def __lt__(self, other):
+        return other.key < self.key
+
+
+def top_k(iterable, k, key=None, largest=True):
+    """
+    I k elementi maggiori (largest=True) o minori di un iterabile qualsiasi,
+    ordinati dal "migliore". Una sola passata con un heap limitato a k elementi:
+    un nuovo elemento entra solo se batte la radice (il peggiore tra i k tenuti).
+    A parità di chiave vince l'elemento che compare prima.
+    Complessità: O(n log k) tempo, O(k) spazio (anche su stream).
+    """
+    if k <= 0:
+        return []
+    heap = []
+    for i, x in enumerate(iterable):
+        kx = x if key is None else key(x)
+        if largest:
+            entry = (kx, -i, x)
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif heap[0][0] < kx:
+                heapq.heapreplace(heap, entry)
+        else:
+            entry = _Reversed((kx, i, x))
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif kx < heap[0].key[0]:
+                heapq.heapreplace(heap, entry)
+
+    if largest:
+        heap.sort(key=lambda e: (e[0], e[1]), reverse=True)
+        return [e[2] for e in heap]
+    heap.sort(key=lambda e: (e.key[0], e.key[1]))
+    return [e.key[2] for e in heap]
+
+
+# =========================
+# 6. COUNTING SORT e RADIX SORT (senza confronti)
+# =========================
+# Radix sort: cifre da 8 bit (256 bucket per passata)
+RADIX_BITS = 8
+RADIX = 1 << RADIX_BITS
+# MSD radix sort: bucket con al più tanti elementi passano a insertion sort
+MSD_INSERTION_CUTOFF = 32
+
+
+def _sort_keys(arr, key):
+    """ Lista delle chiavi di ordinamento (key=None: gli elementi stessi). """
+    return list(arr) if key is None else [key(x) for x in arr]
+
+
+def counting_sort(arr, key=None):
+    """
+    Counting Sort (stabile) per chiavi intere, anche negative.
+    - key: funzione che estrae la chiave intera (default: l'elemento stesso).
+    Conta le occorrenze in un array('l') di k = max - min + 1 contatori,
+    calcola le posizioni di partenza con le somme prefisse e distribuisce.
+    Complessità: O(n + k). Conviene solo se k = O(n), altrimenti radix_sort_lsd.
+    """
+    n = len(arr)
+    if n < 2:
+        return arr
+
+    keys = _sort_keys(arr, key)
+    lo = min(keys)
+    count = array('l', [0]) * (max(keys) - lo + 2)
+    for k in keys:
+        count[k - lo + 1] += 1
+    # somme prefisse: count[k - lo] = prima posizione libera per la chiave k
+    for i in range(1, len(count)):
+        count[i] += count[i - 1]
+
+    out = [None] * n
+    for x, k in zip(arr, keys):
+        pos = count[k - lo]
+        out[pos] = x
+        count[k - lo] = pos + 1
+    arr[:] = out
+    return arr
+
+
+def radix_sort_lsd(arr, key=None, bits=None):
+    """
+    Radix Sort LSD (stabile) per chiavi intere (es. ID a 32/64 bit), anche negative.
+    - key: funzione che estrae la chiave intera (default: l'elemento stesso).
+    - bits: bit per cifra (default: RADIX_BITS, 16 con almeno 2^16 elementi,
+      dove il costo dei 65536 contatori è ammortizzato e le passate si dimezzano).
+    Le chiavi vengono traslate di -min (così i negativi diventano >= 0),
+    poi si ordina per cifre di 'bits' bit, dalla meno significativa.
+    Si ordina una permutazione di indici in due array('l') che si alternano:
+    nessuna lista per bucket, gli elementi si spostano una sola volta alla fine.
+    Le passate in cui tutte le chiavi hanno la stessa cifra vengono saltate.
+    Complessità: O(n * w / RADIX_BITS), w = bit della chiave più grande.
+    """
+    n = len(arr)
+    if n < 2:
+        return arr
+
+    keys = _sort_keys(arr, key)
+    lo = min(keys)
+    if lo != 0:
+        keys = [k - lo for k in keys]
+    max_key = max(keys)
+    if bits is None:
+        bits = 16 if n >= 1 << 16 else RADIX_BITS
+    radix = 1 << bits
+    mask = radix - 1
+
+    order = array('l', range(n))
+    tmp = array('l', [0]) * n
+    shift = 0
+    while max_key >> shift:
+        digits = array('H' if bits <= 16 else 'l', [(k >> shift) & mask for k in keys])
+        count = array('l', [0]) * (radix + 1)
+        for dgt in digits:
+            count[dgt + 1] += 1
+        if max(count) < n:
+            for i in range(1, radix + 1):
+                count[i] += count[i - 1]
+            for idx in order:
+                dgt = digits[idx]
+                tmp[count[dgt]] = idx
+                count[dgt] += 1
+            order, tmp = tmp, order
+        shift += bits
+
+    arr[:] = [arr[i] for i in order]
+    return arr
+
+
+def _insertion_sort_indices(order, keys, lo, hi):
+    """ Insertion sort (stabile) degli indici order[lo:hi] in base a keys. """
+    for i in range(lo + 1, hi):
+        idx = order[i]
+        k = keys[idx]
+        j = i - 1
+        while j >= lo and keys[order[j]] > k:
+            order[j+1] = order[j]
+            j -= 1
+        order[j+1] = idx
+
+
+def radix_sort_msd(arr, key=None):
+    """
+    Radix Sort MSD (stabile) per chiavi bytes (anche di lunghezza diversa).
+    - key: funzione che estrae la chiave bytes (default: l'elemento stesso).
+    Distribuisce per byte, dal più significativo, in 257 bucket
+    (bucket 0 = chiave terminata, quindi "b'ab' < b'abc'").
+    I bucket sono intervalli di una permutazione di indici in array('l');
+    quelli piccoli (<= MSD_INSERTION_CUTOFF) passano a insertion sort.
+    Stack esplicito al posto della ricorsione.
+    Complessità: O(n * L) nel caso peggiore, L = lunghezza massima della chiave.
+    """
+    n = len(arr)
+    if n < 2:
+        return arr
+
+    keys = _sort_keys(arr, key)
+    order = array('l', range(n))
+    tmp = array('l', [0]) * n
+
+    stack = [(0, n, 0)]  # (inizio, fine, indice del byte)
+    while stack:
+        lo, hi, d = stack.pop()
+        if hi - lo <= MSD_INSERTION_CUTOFF:
+            _insertion_sort_indices(order, keys, lo, hi)
+            continue
+
+        count = array('l', [0]) * (RADIX + 2)
+        for i in range(lo, hi):
+            k = keys[order[i]]
+            count[(k[d] + 1 if d < len(k) else 0) + 1] += 1
+        for i in range(1, RADIX + 2):
+            count[i] += count[i - 1]
+        starts = array('l', count)
+
+        for i in range(lo, hi):
+            idx = order[i]
+            k = keys[idx]
+            c = k[d] + 1 if d < len(k) else 0
+            tmp[lo + count[c]] = idx
+            count[c] += 1
+        order[lo:hi] = tmp[lo:hi]
+
+        # il bucket 0 contiene chiavi già terminate (uguali): è già ordinato
+        for c in range(1, RADIX + 1):
+            b_lo, b_hi = lo + starts[c], lo + starts[c + 1]
+            if b_hi - b_lo > 1:
+                stack.append((b_lo, b_hi, d + 1))
+
+    arr[:] = [arr[i] for i in order]
+    return arr
+
+
 # =========================
 # ESEMPIO DI UTILIZZO
 # =========================
@@ -105,3 +560,10 @@ if __name__ == "__main__":
     print("Insertion Sort:", insertion_sort(data.copy()))
     print("Bubble Sort:", bubble_sort(data.copy()))
     print("Quick Sort:", quick_sort(data.copy()))
+    print("Introsort:", intro_sort(data.copy()))
+    print("Mediano (nth_element):", nth_element(data.copy(), len(data) // 2))
+    print("Partial Sort (k=3):", partial_sort(data.copy(), 3)[:3])
+    print("Top 3:", top_k(data, 3), "- minimi 3:", top_k(data, 3, largest=False))
+    print("Counting Sort:", counting_sort(data.copy()))
+    print("Radix Sort LSD:", radix_sort_lsd([-5, 300, 7, -70000, 2**40, 0]))
+    print("Radix Sort MSD:", radix_sort_msd([b"banana", b"ape", b"band", b"ba", b"zebra"]))
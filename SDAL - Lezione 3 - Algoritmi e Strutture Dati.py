@@ -8,6 +8,28 @@
 # Prof. Andrea Cigliano
 # =================================================
 
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from multiprocessing import shared_memory
+import heapq
+import math
+import multiprocessing
+import mmap
+import os
+import pickle
+import struct
+import sys
+import tempfile
+import time
+
+try:
+    import numpy as np  # opzionale: usato solo dai percorsi vettorizzati
+except ImportError:
+    np = None
+
+
 # ========================================
 # 1. LINEAR SEARCH
 # ========================================
@@ -23,6 +45,113 @@ def linear_search(arr, target):
     return -1          # -1 indica che non è presente
 
 
+# ========================================
+# 1.1 LINEAR SEARCH SU FILE (mmap, streaming)
+# ========================================
+# Oltre questo numero di target si scorrono i record uno a uno con un set
+MANY_TARGETS = 16
+
+
+def _delimited_matches(buf, target, delim):
+    """
+    Offset dei record delimitati uguali a target, in ordine crescente.
+    Cerca con buf.find (in C) il pattern delim + target + delim; a parte
+    gestisce il primo record (offset 0) e l'ultimo senza delimitatore finale.
+    """
+    size = len(buf)
+    t, d = len(target), len(delim)
+    if buf[:t + d] == target + delim or (size == t and buf[:t] == target):
+        yield 0
+    pattern = delim + target + delim
+    pos = buf.find(pattern)
+    while pos != -1:
+        yield pos + d
+        pos = buf.find(pattern, pos + d + t)   # il delimitatore finale può aprire il prossimo
+    if size >= t + d and buf[size - t - d:] == delim + target:
+        yield size - t
+
+
+def _delimited_scan(buf, targets, delim):
+    """
+    Per molti target: salta da un delimitatore al successivo con buf.find e
+    confronta con il set solo i record di lunghezza compatibile
+    (gli altri non vengono mai copiati in oggetti bytes).
+    """
+    lengths = {len(t) for t in targets}
+    size = len(buf)
+    start = 0
+    while start <= size:
+        end = buf.find(delim, start)
+        if end == -1:
+            end = size
+        if end - start in lengths and buf[start:end] in targets:
+            yield start
+        if end == size:
+            return
+        start = end + len(delim)
+
+
+def _fixed_matches(buf, target, record_size):
+    """ Offset dei record a lunghezza fissa uguali a target (allineati a record_size). """
+    pos = buf.find(target)
+    while pos != -1:
+        if pos % record_size == 0:
+            yield pos
+            pos = buf.find(target, pos + record_size)
+        else:
+            # occorrenza a cavallo tra record: riparte dal record successivo
+            pos = buf.find(target, (pos // record_size + 1) * record_size)
+
+
+def linear_search_file(source, targets, record_size=None, delimiter=b"\n",
+                       limit=None, pad=b" "):
+    """
+    Linear Search su un file di record senza caricarlo in memoria.
+    - source: percorso del file, oppure un mmap / bytes già aperto
+    - targets: un record (bytes) o un insieme di record cercati
+    - record_size: lunghezza dei record a larghezza fissa; None = record delimitati
+    - delimiter: separatore dei record delimitati (default a capo)
+    - limit: si ferma dopo 'limit' risultati (uscita anticipata)
+    - pad: byte con cui si allungano i target più corti di record_size
+    Il file è mappato in memoria (mmap) e la scansione usa find() in C, a velocità
+    vicina alla banda della page cache; i record non diventano oggetti Python.
+    Ritorna la lista ordinata degli offset (in byte) dei record uguali a un target.
+    """
+    if isinstance(targets, (bytes, bytearray)):
+        targets = [targets]
+    targets = {bytes(t) for t in targets}
+    if record_size is not None:
+        targets = {t.ljust(record_size, pad) for t in targets}
+        if any(len(t) != record_size for t in targets):
+            raise ValueError("target più lungo di record_size")
+    if not targets or b"" in targets:
+        raise ValueError("serve almeno un target non vuoto")
+
+    owned = None
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return []
+            owned = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buf = owned
+    else:
+        buf = source
+
+    try:
+        if record_size is not None:
+            streams = [_fixed_matches(buf, t, record_size) for t in targets]
+        elif len(targets) > MANY_TARGETS:
+            streams = [_delimited_scan(buf, targets, delimiter)]
+        else:
+            streams = [_delimited_matches(buf, t, delimiter) for t in targets]
+        # i generatori sono pigri: con limit la scansione si ferma subito
+        matches = heapq.merge(*streams) if len(streams) > 1 else streams[0]
+        return list(islice(matches, limit))
+    finally:
+        if owned is not None:
+            owned.close()
+
+
 # ========================================
 # 2. BINARY SEARCH
 # ========================================
@@ -45,10 +174,376 @@ def binary_search(arr, target):
     return -1
 
 
+# ========================================
+# 2.1 BINARY SEARCH MULTIPLA / LOWER-UPPER BOUND
+# ========================================
+def lower_bound(arr, target, lo=0, hi=None):
+    """
+    Lower bound: primo indice i in arr[lo:hi] (ordinato) con arr[i] >= target.
+    Se tutti gli elementi sono < target ritorna hi (punto di inserimento).
+    Complessità: O(log n).
+    """
+    if hi is None:
+        hi = len(arr)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if arr[mid] < target:
+            lo = mid + 1     # la risposta è a destra di mid
+        else:
+            hi = mid         # mid può essere la risposta
+    return lo
+
+
+def upper_bound(arr, target, lo=0, hi=None):
+    """
+    Upper bound: primo indice i in arr[lo:hi] (ordinato) con arr[i] > target.
+    upper_bound - lower_bound = numero di occorrenze di target.
+    Complessità: O(log n).
+    """
+    if hi is None:
+        hi = len(arr)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if target < arr[mid]:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+def binary_search_many(sorted_arr, targets):
+    """
+    Ricerca binaria di molti target in una sola chiamata.
+    Ritorna, per ogni target (nell'ordine dato), l'indice della prima occorrenza
+    in sorted_arr oppure -1:
+    - con NumPy e input ndarray / array.array: np.searchsorted vettorizzato
+      (ritorna un ndarray di int64);
+    - altrimenti ordina i target e scorre le due sequenze come in un merge,
+      avanzando nell'array con la ricerca esponenziale (_gallop_left) a partire
+      dalla posizione precedente (ritorna un array('l')).
+    Complessità: O(m log m + m log(n/m)) per m target su n elementi.
+    """
+    if np is not None and any(isinstance(x, (np.ndarray, array))
+                              for x in (sorted_arr, targets)):
+        a = np.asarray(sorted_arr)
+        t = np.asarray(targets)
+        if len(a) == 0:
+            return np.full(len(t), -1, dtype=np.int64)
+        idx = np.searchsorted(a, t, side="left")
+        found = (idx < len(a)) & (a[np.minimum(idx, len(a) - 1)] == t)
+        return np.where(found, idx, -1).astype(np.int64)
+
+    n = len(sorted_arr)
+    result = array('l', [-1]) * len(targets)
+    pos = 0
+    for j in sorted(range(len(targets)), key=targets.__getitem__):
+        t = targets[j]
+        pos = _gallop_left(t, sorted_arr, pos, n)
+        if pos < n and sorted_arr[pos] == t:
+            result[j] = pos
+    return result
+
+
+# ========================================
+# 2.2 INDICE STATICO IN LAYOUT EYTZINGER
+# ========================================
+class StaticSearchIndex:
+    """
+    Indice di ricerca statico costruito da un array ordinato.
+    I valori sono riscritti in ordine BFS di un albero binario implicito
+    (layout di Eytzinger): la radice in posizione 1, i figli di k in 2k e 2k+1.
+    Rispetto alla binary search classica i primi livelli stanno in poche righe
+    di cache contigue e il ciclo di ricerca non ha rami:
+        k = 2*k + (keys[k] < x)
+    Chiavi e ranghi (posizione nell'array ordinato) sono array tipizzati e
+    si salvano su file; load() li mappa in memoria (mmap) senza copiarli.
+    - Costruzione: O(n); ricerca, lower_bound, count_range: O(log n)
+    """
+    _MAGIC = b"SDALEYTZ"
+    _HEADER = struct.Struct("<8s8sQ")  # magic, typecode, n
+
+    def __init__(self, sorted_values, typecode='q'):
+        n = len(sorted_values)
+        keys = array(typecode, [0]) * (n + 1)   # posizione 0 inutilizzata
+        ranks = array('q', [0]) * (n + 1)
+
+        # visita in-order iterativa dell'albero implicito: assegna i valori
+        # ordinati alle posizioni BFS nell'ordine giusto (O(n))
+        i = 0
+        k = 1
+        stack = []
+        while stack or k <= n:
+            while k <= n:
+                stack.append(k)
+                k = 2 * k
+            k = stack.pop()
+            keys[k] = sorted_values[i]
+            ranks[k] = i
+            i += 1
+            k = 2 * k + 1
+
+        self._n = n
+        self._typecode = typecode
+        self._keys = keys
+        self._ranks = ranks
+        self._mmap = None
+
+    def __len__(self):
+        return self._n
+
+    def _lower_bound_pos(self, x):
+        """ Posizione Eytzinger del primo valore >= x, 0 se non esiste. """
+        keys = self._keys
+        n = self._n
+        k = 1
+        while k <= n:
+            k = 2 * k + (keys[k] < x)
+        # risale oltre gli ultimi passi "a destra": toglie gli 1 finali e uno 0
+        return k >> ((~k & (k + 1)).bit_length())
+
+    def lower_bound(self, x):
+        """ Rango del primo valore >= x (len(self) se non esiste). """
+        k = self._lower_bound_pos(x)
+        return self._ranks[k] if k else self._n
+
+    def upper_bound(self, x):
+        """ Rango del primo valore > x (len(self) se non esiste). """
+        keys = self._keys
+        n = self._n
+        k = 1
+        while k <= n:
+            k = 2 * k + (not x < keys[k])
+        k >>= (~k & (k + 1)).bit_length()
+        return self._ranks[k] if k else n
+
+    def search(self, x):
+        """ Rango di x nell'array ordinato (prima occorrenza), -1 se assente. """
+        k = self._lower_bound_pos(x)
+        return self._ranks[k] if k and self._keys[k] == x else -1
+
+    def __contains__(self, x):
+        return self.search(x) != -1
+
+    def count_range(self, lo, hi):
+        """ Numero di valori v con lo <= v < hi. """
+        return max(self.lower_bound(hi) - self.lower_bound(lo), 0)
+
+    def save(self, path):
+        """
+        Salva l'indice: header (magic, typecode, n), poi chiavi e ranghi
+        così come stanno in memoria, ognuno allineato a 8 byte.
+        """
+        with open(path, "wb") as f:
+            f.write(self._HEADER.pack(self._MAGIC, self._typecode.encode(), self._n))
+            for block in (self._keys, self._ranks):
+                data = block.tobytes() if isinstance(block, array) else bytes(block)
+                f.write(data)
+                f.write(b"\0" * (-len(data) % 8))
+
+    @classmethod
+    def load(cls, path):
+        """
+        Apre un indice salvato con save() tramite mmap (sola lettura):
+        le chiavi non vengono lette né copiate, le pagine arrivano dalla
+        page cache al primo accesso (avvio "a caldo" istantaneo).
+        """
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, typecode, n = cls._HEADER.unpack_from(mm, 0)
+        if magic != cls._MAGIC:
+            mm.close()
+            raise ValueError("file non valido per StaticSearchIndex")
+        typecode = typecode.rstrip(b"\0").decode()
+
+        view = memoryview(mm)
+        offset = cls._HEADER.size
+        keys_size = (n + 1) * array(typecode).itemsize
+        ranks_size = (n + 1) * array('q').itemsize
+
+        index = cls.__new__(cls)
+        index._n = n
+        index._typecode = typecode
+        index._keys = view[offset:offset + keys_size].cast(typecode)
+        offset += keys_size + (-keys_size % 8)
+        index._ranks = view[offset:offset + ranks_size].cast('q')
+        view.release()
+        index._mmap = mm
+        return index
+
+    def close(self):
+        """ Rilascia la mappatura del file (solo per indici aperti con load). """
+        if self._mmap is not None:
+            self._keys.release()
+            self._ranks.release()
+            self._mmap.close()
+            self._mmap = None
+
+
+# ========================================
+# 2.3 INTERPOLATION / EXPONENTIAL SEARCH e dispatcher
+# ========================================
+def _is_finite(x):
+    """ True per gli int e per i float diversi da ±inf e NaN. """
+    return not isinstance(x, float) or math.isfinite(x)
+
+
+def interpolation_search(arr, target):
+    """
+    Interpolation Search (array ordinato di numeri):
+    stima la posizione del target come in un elenco telefonico,
+        mid = lo + (target - arr[lo]) * (hi - lo) / (arr[hi] - arr[lo])
+    Su chiavi quasi uniformi servono O(log log n) accessi.
+    Protezione per dati sbilanciati: se un passo non dimezza almeno
+    l'intervallo, il passo successivo è un normale passo binario,
+    quindi il caso peggiore resta O(log n).
+    Anche con un estremo infinito (±inf) si fa un passo binario: la stima
+    non avrebbe senso (inf - inf = NaN).
+    """
+    lo, hi = 0, len(arr) - 1
+    bisect_step = False
+    while lo <= hi:
+        a_lo, a_hi = arr[lo], arr[hi]
+        if target < a_lo or target > a_hi:
+            return -1
+        span = a_hi - a_lo
+        if bisect_step or span == 0 or not _is_finite(span):
+            mid = (lo + hi) // 2
+        else:
+            # rapporto in [0, 1] prima di moltiplicare: niente overflow
+            mid = lo + int((target - a_lo) / span * (hi - lo))
+        size = hi - lo
+        value = arr[mid]
+        if value == target:
+            return mid
+        elif value < target:
+            lo = mid + 1
+        else:
+            hi = mid - 1
+        bisect_step = hi - lo > size // 2
+    return -1
+
+
+def exponential_search(source, target):
+    """
+    Exponential (galloping) Search su una sequenza ordinata anche di lunghezza
+    ignota: basta che source[i] sollevi IndexError oltre la fine (es. LazySequence).
+    1) prova gli indici 0, 1, 3, 7, ... finché trova un valore >= target
+       o esce dalla sequenza;
+    2) binary search nell'ultimo intervallo (gli indici fuori = +infinito).
+    Complessità: O(log i), i = posizione del target (non dipende da n).
+    """
+    lo = 0
+    bound = 1
+    while True:
+        try:
+            value = source[bound - 1]
+        except IndexError:
+            break
+        if value >= target:
+            break
+        lo = bound      # tutti gli indici < bound hanno valore < target
+        bound *= 2
+
+    hi = bound - 1
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        try:
+            value = source[mid]
+        except IndexError:
+            hi = mid - 1     # oltre la fine
+            continue
+        if value == target:
+            return mid
+        elif value < target:
+            lo = mid + 1
+        else:
+            hi = mid - 1
+    return -1
+
+
+class LazySequence:
+    """
+    Sequenza materializzata su richiesta da un iteratore (anche infinito):
+    source[i] consuma l'iteratore solo fino all'elemento i.
+    Non ha len(): va bene per exponential_search.
+    """
+    def __init__(self, iterable):
+        self._it = iter(iterable)
+        self._items = []
+
+    def __getitem__(self, i):
+        if i < 0:
+            raise IndexError("indici negativi non supportati")
+        while len(self._items) <= i:
+            try:
+                self._items.append(next(self._it))
+            except StopIteration:
+                raise IndexError("indice oltre la fine della sorgente") from None
+        return self._items[i]
+
+
+class _ProbeCounter:
+    """ Proxy che conta gli accessi (probe) a una sequenza, per i benchmark. """
+    def __init__(self, seq, stats):
+        self._seq = seq
+        self._stats = stats
+
+    def __len__(self):
+        return len(self._seq)
+
+    def __getitem__(self, i):
+        self._stats["probes"] += 1
+        return self._seq[i]
+
+
+SEARCH_STRATEGIES = ("auto", "linear", "binary", "interpolation", "exponential")
+
+
+def _choose_strategy(arr, target):
+    """ Strategia per "auto": la sorgente dice se la lunghezza è nota e se è numerica. """
+    if not hasattr(arr, "__len__"):
+        return "exponential"
+    if len(arr) < 16:
+        return "binary"
+    numbers = (int, float)
+    first, last = arr[0], arr[-1]
+    if isinstance(target, numbers) and isinstance(first, numbers) \
+            and isinstance(last, numbers) and _is_finite(first) and _is_finite(last):
+        return "interpolation"
+    return "binary"
+
+
+def search(arr, target, strategy="auto", stats=None):
+    """
+    Punto di accesso unico alle ricerche:
+    - strategy: "linear", "binary", "interpolation", "exponential" o "auto"
+      (exponential se la lunghezza è ignota, interpolation su numeri con estremi
+      finiti, altrimenti binary)
+    - stats: dict opzionale; riceve "strategy" e "probes" (accessi all'array)
+    Ritorna l'indice del target o -1 (tutte tranne linear richiedono arr ordinato).
+    """
+    if strategy not in SEARCH_STRATEGIES:
+        raise ValueError(f"strategy deve essere una tra {SEARCH_STRATEGIES}")
+    if strategy == "auto":
+        strategy = _choose_strategy(arr, target)
+    if stats is not None:
+        stats["strategy"] = strategy
+        stats.setdefault("probes", 0)
+        arr = _ProbeCounter(arr, stats)
+
+    if strategy == "linear":
+        return linear_search(arr, target)
+    if strategy == "binary":
+        return binary_search(arr, target)
+    if strategy == "interpolation":
+        return interpolation_search(arr, target)
+    return exponential_search(arr, target)
+
+
 # ========================================
 # 3. MERGE SORT
 # ========================================
-def merge_sort(arr):
+def merge_sort(arr, adaptive=False, parallel=False):
     """
     Merge Sort:
     Algoritmo 'divide et impera':
@@ -57,7 +552,15 @@ def merge_sort(arr):
     - unisce i risultati.
     Complessità: O(n log n) in tutti i casi.
     Spazio: O(n) (usa array ausiliari).
+    Con adaptive=True usa natural_merge_sort (run naturali + galloping)
+    su una copia dell'input: O(n) se l'array è già ordinato.
+    Con parallel=True usa parallel_merge_sort (più processi) su una copia.
     """
+    if adaptive:
+        return natural_merge_sort(list(arr))
+    if parallel:
+        return parallel_merge_sort(list(arr))
+
     if len(arr) <= 1:
         return arr
 
@@ -68,8 +571,15 @@ def merge_sort(arr):
     return merge(left_half, right_half)
 
 
-def merge(left, right):
-    """ Funzione di supporto per unire due liste ordinate """
+def merge(left, right, gallop=False):
+    """
+    Funzione di supporto per unire due liste ordinate.
+    Con gallop=True, quando un lato vince MIN_GALLOP confronti di fila
+    si passa alla ricerca esponenziale e si copia l'intero blocco vincente.
+    """
+    if gallop:
+        return _merge_galloping(left, right)
+
     merged = []
     i = j = 0
 
@@ -89,6 +599,434 @@ def merge(left, right):
     return merged
 
 
+# ========================================
+# 3.1 MERGE SORT ADATTIVO (run naturali + galloping)
+# ========================================
+# Vittorie consecutive di un lato dopo le quali si entra in modalità galloping
+MIN_GALLOP = 7
+
+
+def _gallop_right(x, a, lo, hi):
+    """
+    Ricerca esponenziale in a[lo:hi] (ordinato): primo indice k con a[k] > x.
+    Prova le posizioni lo, lo+1, lo+3, lo+7, ... e poi rifinisce con bisect.
+    Costo O(log d), dove d è la distanza del risultato da lo.
+    """
+    last = lo
+    ofs = 1
+    while lo + ofs - 1 < hi and a[lo + ofs - 1] <= x:
+        last = lo + ofs
+        ofs *= 2
+    return bisect_right(a, x, last, min(lo + ofs - 1, hi))
+
+
+def _gallop_left(x, a, lo, hi):
+    """ Come _gallop_right, ma ritorna il primo indice k con a[k] >= x. """
+    last = lo
+    ofs = 1
+    while lo + ofs - 1 < hi and a[lo + ofs - 1] < x:
+        last = lo + ofs
+        ofs *= 2
+    return bisect_left(a, x, last, min(lo + ofs - 1, hi))
+
+
+def _merge_galloping(left, right):
+    """ Merge stabile con galloping (a parità vince sempre left). """
+    merged = []
+    i = j = 0
+    n_left, n_right = len(left), len(right)
+    wins_left = wins_right = 0
+
+    while i < n_left and j < n_right:
+        if left[i] <= right[j]:
+            merged.append(left[i])
+            i += 1
+            wins_left += 1
+            wins_right = 0
+            if wins_left >= MIN_GALLOP and i < n_left:
+                # copia in blocco tutti gli elementi di left <= right[j]
+                k = _gallop_right(right[j], left, i, n_left)
+                merged.extend(left[i:k])
+                i = k
+                wins_left = 0
+        else:
+            merged.append(right[j])
+            j += 1
+            wins_right += 1
+            wins_left = 0
+            if wins_right >= MIN_GALLOP and j < n_right:
+                # copia in blocco tutti gli elementi di right < left[i]
+                k = _gallop_left(left[i], right, j, n_right)
+                merged.extend(right[j:k])
+                j = k
+                wins_right = 0
+
+    merged.extend(left[i:])
+    merged.extend(right[j:])
+    return merged
+
+
+def _min_run_length(n):
+    """ Lunghezza minima delle run (come in Timsort): valore in [32, 64]. """
+    r = 0
+    while n >= 64:
+        r |= n & 1
+        n >>= 1
+    return n + r
+
+
+def _count_run_and_make_ascending(arr, lo, n):
+    """
+    Ritorna la lunghezza della run che parte da lo.
+    Una run è non decrescente oppure strettamente decrescente:
+    in quest'ultimo caso viene invertita in-place (stretta = stabilità preservata).
+    """
+    hi = lo + 1
+    if hi == n:
+        return 1
+    if arr[hi] < arr[lo]:
+        # run strettamente decrescente
+        while hi + 1 < n and arr[hi + 1] < arr[hi]:
+            hi += 1
+        arr[lo:hi + 1] = arr[lo:hi + 1][::-1]
+    else:
+        # run non decrescente
+        while hi + 1 < n and arr[hi + 1] >= arr[hi]:
+            hi += 1
+    return hi + 1 - lo
+
+
+def _binary_insertion_sort(arr, lo, hi, start):
+    """
+    Estende la run ordinata arr[lo:start] fino a hi con insertion sort binario:
+    la posizione si trova con bisect_right (stabile), lo shift è uno slice.
+    """
+    for i in range(start, hi):
+        x = arr[i]
+        pos = bisect_right(arr, x, lo, i)
+        if pos < i:
+            arr[pos + 1:i + 1] = arr[pos:i]
+            arr[pos] = x
+
+
+def _merge_at(arr, runs, i):
+    """ Fonde le run runs[i] e runs[i+1] (adiacenti) in arr. """
+    start, len_a = runs[i]
+    len_b = runs[i + 1][1]
+    mid = start + len_a
+    end = mid + len_b
+    runs[i] = (start, len_a + len_b)
+    del runs[i + 1]
+    # run già in ordine tra loro: nessun merge
+    if arr[mid - 1] <= arr[mid]:
+        return
+    arr[start:end] = merge(arr[start:mid], arr[mid:end], gallop=True)
+
+
+def _merge_collapse(arr, runs):
+    """
+    Mantiene bilanciato lo stack delle run (invarianti di Timsort):
+      len[n-2] > len[n-1] + len[n]  e  len[n-1] > len[n]
+    così la profondità dello stack resta O(log n).
+    """
+    while len(runs) > 1:
+        n = len(runs) - 2
+        if (n > 0 and runs[n - 1][1] <= runs[n][1] + runs[n + 1][1]) or \
+           (n > 1 and runs[n - 2][1] <= runs[n - 1][1] + runs[n][1]):
+            if runs[n - 1][1] < runs[n + 1][1]:
+                n -= 1
+            _merge_at(arr, runs, n)
+        elif runs[n][1] <= runs[n + 1][1]:
+            _merge_at(arr, runs, n)
+        else:
+            break
+
+
+def natural_merge_sort(arr):
+    """
+    Merge Sort adattivo (in-place sulla lista, stabile):
+    - individua le run naturali (crescenti o strettamente decrescenti),
+    - allunga le run troppo corte con insertion sort binario,
+    - le fonde con uno stack di run bilanciato e merge con galloping.
+    Complessità: O(n) su input già ordinato (o ordinato al contrario),
+                 O(n log n) nel caso peggiore.
+    """
+    n = len(arr)
+    if n < 2:
+        return arr
+
+    min_run = _min_run_length(n)
+    runs = []  # stack di (inizio, lunghezza)
+    lo = 0
+    while lo < n:
+        run_len = _count_run_and_make_ascending(arr, lo, n)
+        if run_len < min_run:
+            forced = min(min_run, n - lo)
+            _binary_insertion_sort(arr, lo, lo + forced, lo + run_len)
+            run_len = forced
+        runs.append((lo, run_len))
+        _merge_collapse(arr, runs)
+        lo += run_len
+
+    # fonde le run rimaste, dalla cima dello stack
+    while len(runs) > 1:
+        n_top = len(runs) - 2
+        if n_top > 0 and runs[n_top - 1][1] < runs[n_top + 1][1]:
+            n_top -= 1
+        _merge_at(arr, runs, n_top)
+    return arr
+
+
+# ========================================
+# 3.2 MERGE SORT BOTTOM-UP (un solo buffer ausiliario)
+# ========================================
+# Larghezza dei blocchi iniziali ordinati con insertion sort binario
+BOTTOM_UP_BLOCK = 32
+
+
+def _merge_into(src, dst, lo, mid, hi):
+    """
+    Fonde src[lo:mid] e src[mid:hi] (ordinati) scrivendo in dst[lo:hi].
+    Stabile: a parità si prende l'elemento di sinistra.
+    """
+    i, j, k = lo, mid, lo
+    while i < mid and j < hi:
+        if src[j] < src[i]:
+            dst[k] = src[j]
+            j += 1
+        else:
+            dst[k] = src[i]
+            i += 1
+        k += 1
+    # una sola delle due metà ha ancora elementi
+    if i < mid:
+        dst[k:hi] = src[i:mid]
+    else:
+        dst[k:hi] = src[j:hi]
+
+
+def merge_sort_inplace(arr):
+    """
+    Merge Sort bottom-up (iterativo, stabile, modifica arr):
+    - ordina blocchi di BOTTOM_UP_BLOCK elementi con insertion sort binario,
+    - fonde blocchi di larghezza 1x, 2x, 4x, ... alternando ("ping-pong")
+      tra arr e un unico buffer ausiliario di n elementi allocato una volta,
+    - salta il merge quando le due metà sono già in ordine (left[-1] <= right[0]).
+    Complessità: O(n log n), O(n) se già ordinato.
+    Spazio: un buffer di n riferimenti (picco ~2n), nessuna ricorsione.
+    """
+    n = len(arr)
+    if n < 2:
+        return arr
+
+    for lo in range(0, n, BOTTOM_UP_BLOCK):
+        _binary_insertion_sort(arr, lo, min(lo + BOTTOM_UP_BLOCK, n), lo + 1)
+
+    src, dst = arr, [None] * n
+    width = BOTTOM_UP_BLOCK
+    while width < n:
+        for lo in range(0, n, 2 * width):
+            mid = min(lo + width, n)
+            hi = min(lo + 2 * width, n)
+            if mid >= hi or src[mid - 1] <= src[mid]:
+                # metà già in ordine (o senza compagna): basta copiarla
+                dst[lo:hi] = src[lo:hi]
+            else:
+                _merge_into(src, dst, lo, mid, hi)
+        src, dst = dst, src
+        width *= 2
+
+    # il risultato finale è nel buffer: lo riporto in arr
+    if src is not arr:
+        arr[:] = src
+    return arr
+
+
+# ========================================
+# 3.3 MERGE SORT PARALLELO (processi + memoria condivisa)
+# ========================================
+# Sotto questa dimensione il costo dei processi supera il guadagno: si va in seriale
+PARALLEL_THRESHOLD = 200_000
+# Campioni per partizione usati per scegliere gli splitter del merge parallelo
+PARALLEL_OVERSAMPLING = 32
+
+
+def _fork_context():
+    """
+    Contesto multiprocessing "fork", o None dove non esiste (Windows).
+    I file delle lezioni hanno spazi nel nome e si caricano con importlib:
+    con "spawn"/"forkserver" (default su macOS/Windows e, da Python 3.14, su
+    Linux) i worker reimportano il modulo per nome e non lo trovano, quindi
+    serve un fork, che eredita il modulo già caricato.
+    """
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return None
+
+
+def _shared_typecode(arr):
+    """
+    Typecode di array per copiare arr in memoria condivisa, o None se non numerico:
+    array.array -> il suo typecode, tutti int -> 'q', tutti float -> 'd'.
+    """
+    if isinstance(arr, array):
+        return arr.typecode
+    if all(type(x) is int for x in arr):
+        return 'q'
+    if all(type(x) is float for x in arr):
+        return 'd'
+    return None
+
+
+def _shared_view(shm, typecode):
+    """
+    Vista tipizzata (memoryview.cast) su un blocco di memoria condivisa.
+    Alcuni sistemi arrotondano la dimensione alla pagina: si taglia a multipli dell'item.
+    """
+    itemsize = array(typecode).itemsize
+    return shm.buf[:len(shm.buf) // itemsize * itemsize].cast(typecode)
+
+
+def _sort_partition(name, typecode, lo, hi):
+    """ Worker: ordina (merge_sort_inplace) la partizione [lo, hi) del buffer condiviso. """
+    shm = shared_memory.SharedMemory(name=name)
+    view = _shared_view(shm, typecode)
+    try:
+        part = view[lo:hi].tolist()
+        merge_sort_inplace(part)
+        view[lo:hi] = array(typecode, part)
+    finally:
+        view.release()
+        shm.close()
+
+
+def _merge_segment(src_name, dst_name, typecode, ranges, out_lo):
+    """
+    Worker: fonde (kway_merge) i tratti ordinati 'ranges' del buffer sorgente
+    e scrive il risultato nel buffer destinazione a partire da out_lo.
+    """
+    src = shared_memory.SharedMemory(name=src_name)
+    dst = shared_memory.SharedMemory(name=dst_name)
+    src_view = _shared_view(src, typecode)
+    dst_view = _shared_view(dst, typecode)
+    try:
+        runs = [src_view[lo:hi].tolist() for lo, hi in ranges]
+        merged = array(typecode, kway_merge(runs))
+        dst_view[out_lo:out_lo + len(merged)] = merged
+    finally:
+        src_view.release()
+        dst_view.release()
+        src.close()
+        dst.close()
+
+
+def parallel_merge_sort(arr, workers=None, threshold=PARALLEL_THRESHOLD):
+    """
+    Merge Sort parallelo per dati numerici (modifica arr e lo ritorna).
+    - workers: numero di processi (default: os.cpu_count())
+    - threshold: sotto questa dimensione si usa merge_sort_inplace (seriale)
+    Fasi:
+      1) arr viene copiato una volta in memoria condivisa (multiprocessing.shared_memory)
+         e diviso in 'workers' partizioni, ordinate in parallelo da un
+         ProcessPoolExecutor: ai worker passano solo nome del buffer e indici,
+         l'array non viene mai serializzato con pickle;
+      2) splitter da un campione regolare delle partizioni ordinate (come nel
+         sample sort): ogni splitter taglia ogni partizione con una bisect;
+      3) ogni worker fonde a k vie i tratti del proprio segmento e li scrive
+         in un secondo buffer condiviso, nella posizione finale.
+    Dati non numerici (o misti int/float) usano sempre il percorso seriale,
+    come le piattaforme senza start method "fork" (vedi _fork_context).
+    Complessità: O((n log n) / p + n log p) con p processi, Spazio: 2n nel buffer.
+    """
+    n = len(arr)
+    workers = workers or os.cpu_count() or 1
+    typecode = _shared_typecode(arr) if n >= max(threshold, 2) and workers > 1 else None
+    context = _fork_context()
+    if typecode is None or context is None:
+        return merge_sort_inplace(arr)
+
+    try:
+        data = array(typecode, arr)
+    except OverflowError:
+        # int fuori dal range a 64 bit: niente memoria condivisa
+        return merge_sort_inplace(arr)
+
+    size = len(data) * data.itemsize
+    src = shared_memory.SharedMemory(create=True, size=size)
+    dst = shared_memory.SharedMemory(create=True, size=size)
+    src_view = _shared_view(src, typecode)
+    dst_view = _shared_view(dst, typecode)
+    try:
+        src_view[:n] = data
+        del data
+        bounds = [n * i // workers for i in range(workers + 1)]
+        parts = list(zip(bounds, bounds[1:]))
+
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            # Fase 1: ordinamento delle partizioni
+            for f in [pool.submit(_sort_partition, src.name, typecode, lo, hi)
+                      for lo, hi in parts]:
+                f.result()
+
+            # Fase 2: splitter da un campione regolare di ogni partizione
+            sample = []
+            for lo, hi in parts:
+                step = max((hi - lo) // PARALLEL_OVERSAMPLING, 1)
+                sample.extend(src_view[k] for k in range(lo, hi, step))
+            sample.sort()
+            splitters = [sample[len(sample) * i // workers] for i in range(1, workers)]
+            cuts = [[lo] + [bisect_right(src_view, x, lo, hi) for x in splitters] + [hi]
+                    for lo, hi in parts]
+
+            # Fase 3: merge a k vie dei segmenti, in parallelo
+            futures = []
+            out_lo = 0
+            for seg in range(workers):
+                ranges = [(c[seg], c[seg + 1]) for c in cuts if c[seg] < c[seg + 1]]
+                futures.append(pool.submit(_merge_segment, src.name, dst.name,
+                                           typecode, ranges, out_lo))
+                out_lo += sum(hi - lo for lo, hi in ranges)
+            for f in futures:
+                f.result()
+
+        if isinstance(arr, array):
+            arr[:] = array(typecode, dst_view[:n])
+        else:
+            arr[:] = dst_view[:n].tolist()
+    finally:
+        src_view.release()
+        dst_view.release()
+        for shm in (src, dst):
+            shm.close()
+            shm.unlink()
+    return arr
+
+
+def benchmark_parallel_merge_sort(n=1_000_000, workers=None, repeat=3):
+    """
+    Confronta merge_sort_inplace (seriale) e parallel_merge_sort su n float casuali.
+    Ritorna un dict con i tempi migliori (secondi) e lo speedup.
+    """
+    import random
+
+    workers = workers or os.cpu_count() or 1
+    data = [random.random() for _ in range(n)]
+    best_serial = best_parallel = float("inf")
+    for _ in range(repeat):
+        a = data.copy()
+        t0 = time.perf_counter()
+        merge_sort_inplace(a)
+        best_serial = min(best_serial, time.perf_counter() - t0)
+
+        b = data.copy()
+        t0 = time.perf_counter()
+        parallel_merge_sort(b, workers=workers, threshold=0)
+        best_parallel = min(best_parallel, time.perf_counter() - t0)
+        assert a == b
+    return {"n": n, "workers": workers, "serial_s": best_serial,
+            "parallel_s": best_parallel, "speedup": best_serial / best_parallel}
+
+
 # ========================================
 # 4. HEAP SORT
 # ========================================
@@ -98,23 +1036,27 @@ def heapify(arr, n, i):
     - arr: array da ordinare
     - n: dimensione dell'heap
     - i: indice della radice del sottoalbero
+    Versione iterativa: un ciclo al posto della ricorsione (nessun frame per livello).
     """
-    largest = i
-    left = 2 * i + 1     # figlio sinistro
-    right = 2 * i + 2    # figlio destro
+    while True:
+        largest = i
+        left = 2 * i + 1     # figlio sinistro
+        right = 2 * i + 2    # figlio destro
 
-    # confronta con figlio sinistro
-    if left < n and arr[left] > arr[largest]:
-        largest = left
+        # confronta con figlio sinistro
+        if left < n and arr[left] > arr[largest]:
+            largest = left
 
-    # confronta con figlio destro
-    if right < n and arr[right] > arr[largest]:
-        largest = right
+        # confronta con figlio destro
+        if right < n and arr[right] > arr[largest]:
+            largest = right
 
-    # se il nodo radice non è il più grande, scambia e ricorsione
-    if largest != i:
+        # se il nodo radice è il più grande la proprietà vale: fine
+        if largest == i:
+            return
+        # altrimenti scambia e prosegui nel sottoalbero
         arr[i], arr[largest] = arr[largest], arr[i]
-        heapify(arr, n, largest)
+        i = largest
 
 
 def heap_sort(arr):
@@ -141,6 +1083,549 @@ def heap_sort(arr):
     return arr
 
 
+# ========================================
+# 4.1 HEAP SORT d-ARIO (iterativo, sift-down di Floyd)
+# ========================================
+def _sift_down_dary(arr, n, i, d):
+    """
+    Sift-down iterativo in un max-heap d-ario arr[0:n] (figli di i: d*i+1 .. d*i+d).
+    Usa un "buco" che scende: un'assegnazione per livello invece di uno scambio.
+    """
+    x = arr[i]
+    while True:
+        first = d * i + 1
+        if first >= n:
+            break
+        # figlio maggiore tra i (al più) d figli contigui
+        last = first + d if first + d < n else n
+        best = first
+        big = arr[first]
+        for c in range(first + 1, last):
+            if arr[c] > big:
+                best = c
+                big = arr[c]
+        if not big > x:
+            break
+        arr[i] = big
+        i = best
+    arr[i] = x
+
+
+def _sift_down_floyd(arr, n, x, d):
+    """
+    Inserisce x in un heap d-ario arr[0:n] che ha un buco alla radice (Floyd):
+    1) fa scendere il buco fino a una foglia seguendo sempre il figlio maggiore,
+       senza confrontarlo con x (d-1 confronti per livello invece di d);
+    2) fa risalire x dalla foglia: dopo un'estrazione x è quasi sempre piccolo,
+       quindi risale di pochissimi livelli.
+    """
+    i = 0
+    while True:
+        first = d * i + 1
+        if first >= n:
+            break
+        last = first + d if first + d < n else n
+        best = first
+        big = arr[first]
+        for c in range(first + 1, last):
+            if arr[c] > big:
+                best = c
+                big = arr[c]
+        arr[i] = big
+        i = best
+    while i > 0:
+        p = (i - 1) // d
+        if not arr[p] < x:
+            break
+        arr[i] = arr[p]
+        i = p
+    arr[i] = x
+
+
+def _sift_down_floyd_2(arr, n, x):
+    """ _sift_down_floyd per d = 2, con la scelta del figlio scritta per esteso. """
+    i = 0
+    c = 1
+    while c < n:
+        r = c + 1
+        if r < n and arr[r] > arr[c]:
+            c = r
+        arr[i] = arr[c]
+        i = c
+        c = 2 * c + 1
+    while i > 0:
+        p = (i - 1) >> 1
+        if not arr[p] < x:
+            break
+        arr[i] = arr[p]
+        i = p
+    arr[i] = x
+
+
+def _sift_down_floyd_4(arr, n, x):
+    """ _sift_down_floyd per d = 4: i quattro figli confrontati senza ciclo interno. """
+    i = 0
+    c = 1
+    while c < n:
+        if c + 3 < n:
+            best, big = c, arr[c]
+            v = arr[c + 1]
+            if v > big:
+                best, big = c + 1, v
+            v = arr[c + 2]
+            if v > big:
+                best, big = c + 2, v
+            v = arr[c + 3]
+            if v > big:
+                best, big = c + 3, v
+        else:
+            # ultimo nodo interno: meno di quattro figli
+            best, big = c, arr[c]
+            for k in range(c + 1, n):
+                if arr[k] > big:
+                    best, big = k, arr[k]
+        arr[i] = big
+        i = best
+        c = 4 * i + 1
+    while i > 0:
+        p = (i - 1) >> 2
+        if not arr[p] < x:
+            break
+        arr[i] = arr[p]
+        i = p
+    arr[i] = x
+
+
+def heap_sort_dary(arr, arity=4):
+    """
+    Heap Sort iterativo su heap d-ario (arity = 2, 4, 8, ...):
+    - costruzione bottom-up con sift-down iterativo,
+    - estrazioni con il sift-down di Floyd (circa metà dei confronti).
+    Un'arità maggiore riduce l'altezza dell'albero (log_d n) e tiene i figli
+    di un nodo contigui in memoria. Per d = 2 e d = 4 le estrazioni usano
+    versioni con la scelta del figlio srotolata (nessun range per livello).
+    Complessità: O(n log n) in tutti i casi. Spazio: O(1) (in-place).
+    """
+    if arity < 2:
+        raise ValueError("arity deve essere almeno 2")
+    d = arity
+    n = len(arr)
+
+    # costruisce l'heap (ultimo nodo interno: (n - 2) // d)
+    for i in range((n - 2) // d, -1, -1):
+        _sift_down_dary(arr, n, i, d)
+
+    # estrae il massimo e reinserisce l'ultimo elemento con Floyd
+    if d == 2:
+        for end in range(n - 1, 0, -1):
+            x = arr[end]
+            arr[end] = arr[0]
+            _sift_down_floyd_2(arr, end, x)
+    elif d == 4:
+        for end in range(n - 1, 0, -1):
+            x = arr[end]
+            arr[end] = arr[0]
+            _sift_down_floyd_4(arr, end, x)
+    else:
+        for end in range(n - 1, 0, -1):
+            x = arr[end]
+            arr[end] = arr[0]
+            _sift_down_floyd(arr, end, x, d)
+
+    return arr
+
+
+class _Counted:
+    """ Valore che conta i confronti eseguiti su di sé (per i benchmark). """
+    __slots__ = ("value",)
+    comparisons = 0
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        _Counted.comparisons += 1
+        return self.value < other.value
+
+    def __gt__(self, other):
+        _Counted.comparisons += 1
+        return self.value > other.value
+
+
+def benchmark_heap_sort(n=100_000, arities=(2, 4, 8), seed=0):
+    """
+    Confronta heap_sort (riferimento) e heap_sort_dary per ogni arità su n float casuali.
+    Ritorna una lista di dict con confronti e tempo (secondi, senza contatore).
+    """
+    import random
+
+    rng = random.Random(seed)
+    data = [rng.random() for _ in range(n)]
+    variants = [("heap_sort", heap_sort)]
+    variants += [(f"heap_sort_dary(arity={d})", lambda a, d=d: heap_sort_dary(a, d))
+                 for d in arities]
+
+    results = []
+    for name, fn in variants:
+        a = data.copy()
+        t0 = time.perf_counter()
+        fn(a)
+        elapsed = time.perf_counter() - t0
+
+        _Counted.comparisons = 0
+        fn([_Counted(x) for x in data])
+        results.append({"algorithm": name, "n": n,
+                        "comparisons": _Counted.comparisons, "seconds": elapsed})
+    return results
+
+
+# ========================================
+# 4.2 ARGSORT (si ordinano indici, non record)
+# ========================================
+ARGSORT_ALGORITHMS = ("merge", "heap", "quick")
+
+
+def _insertion_argsort(keys, order, lo, hi):
+    """ Insertion sort (stabile) degli indici order[lo:hi] per keys[indice]. """
+    for i in range(lo + 1, hi):
+        idx = order[i]
+        k = keys[idx]
+        j = i - 1
+        while j >= lo and k < keys[order[j]]:
+            order[j+1] = order[j]
+            j -= 1
+        order[j+1] = idx
+
+
+def _merge_argsort(keys, order):
+    """
+    Merge sort bottom-up (stabile) della permutazione 'order' per keys[indice],
+    con un solo buffer array('l') come merge_sort_inplace. Ritorna la permutazione
+    ordinata (order stesso oppure il buffer).
+    """
+    n = len(order)
+    for lo in range(0, n, BOTTOM_UP_BLOCK):
+        _insertion_argsort(keys, order, lo, min(lo + BOTTOM_UP_BLOCK, n))
+
+    src, dst = order, array('l', [0]) * n
+    width = BOTTOM_UP_BLOCK
+    while width < n:
+        for lo in range(0, n, 2 * width):
+            mid = min(lo + width, n)
+            hi = min(lo + 2 * width, n)
+            if mid >= hi or not keys[src[mid]] < keys[src[mid - 1]]:
+                dst[lo:hi] = src[lo:hi]
+                continue
+            i, j, k = lo, mid, lo
+            while i < mid and j < hi:
+                if keys[src[j]] < keys[src[i]]:
+                    dst[k] = src[j]
+                    j += 1
+                else:
+                    dst[k] = src[i]
+                    i += 1
+                k += 1
+            if i < mid:
+                dst[k:hi] = src[i:mid]
+            else:
+                dst[k:hi] = src[j:hi]
+        src, dst = dst, src
+        width *= 2
+    return src
+
+
+def _sift_down_indices(keys, order, lo, n, i):
+    """ Sift-down (max-heap binario, iterativo) sugli indici order[lo:lo+n]. """
+    idx = order[lo + i]
+    k = keys[idx]
+    while True:
+        child = 2 * i + 1
+        if child >= n:
+            break
+        if child + 1 < n and keys[order[lo + child]] < keys[order[lo + child + 1]]:
+            child += 1
+        if not k < keys[order[lo + child]]:
+            break
+        order[lo + i] = order[lo + child]
+        i = child
+    order[lo + i] = idx
+
+
+def _heap_argsort_range(keys, order, lo, hi):
+    """ Heap sort degli indici order[lo:hi] per keys[indice]. """
+    n = hi - lo
+    for i in range(n // 2 - 1, -1, -1):
+        _sift_down_indices(keys, order, lo, n, i)
+    for end in range(n - 1, 0, -1):
+        order[lo], order[lo + end] = order[lo + end], order[lo]
+        _sift_down_indices(keys, order, lo, end, 0)
+
+
+def _quick_argsort(keys, order):
+    """
+    Quick sort (introsort) degli indici: mediano di tre, partizione di Hoare,
+    insertion sort sotto BOTTOM_UP_BLOCK, heap sort oltre 2*log2(n) livelli.
+    """
+    n = len(order)
+    if n < 2:
+        return order
+    stack = [(0, n, 2 * (n.bit_length() - 1))]
+    while stack:
+        lo, hi, depth = stack.pop()
+        while True:
+            if hi - lo <= BOTTOM_UP_BLOCK:
+                _insertion_argsort(keys, order, lo, hi)
+                break
+            if depth == 0:
+                _heap_argsort_range(keys, order, lo, hi)
+                break
+            depth -= 1
+
+            # mediano di tre (per chiave) portato in testa come pivot
+            mid = (lo + hi) // 2
+            p = sorted((lo, mid, hi - 1), key=lambda q: keys[order[q]])[1]
+            order[lo], order[p] = order[p], order[lo]
+            pivot = keys[order[lo]]
+
+            # partizione di Hoare
+            i, j = lo - 1, hi
+            while True:
+                i += 1
+                while keys[order[i]] < pivot:
+                    i += 1
+                j -= 1
+                while pivot < keys[order[j]]:
+                    j -= 1
+                if i >= j:
+                    break
+                order[i], order[j] = order[j], order[i]
+
+            if j + 1 - lo < hi - (j + 1):
+                stack.append((j + 1, hi, depth))
+                hi = j + 1
+            else:
+                stack.append((lo, j + 1, depth))
+                lo = j + 1
+    return order
+
+
+def argsort(keys, algorithm="merge", key=None):
+    """
+    Argsort: ritorna la permutazione (array('l')) che ordina keys, senza spostarle:
+    keys[order[0]] <= keys[order[1]] <= ...
+    - algorithm: "merge" (stabile), "heap" oppure "quick" (non stabili)
+    - key: funzione applicata a ogni elemento prima del confronto
+    Utile con record "larghi" o dati a colonne: si ordinano solo interi compatti
+    e i dati si riordinano una volta sola alla fine (vedi take).
+    """
+    if algorithm not in ARGSORT_ALGORITHMS:
+        raise ValueError(f"algorithm deve essere uno tra {ARGSORT_ALGORITHMS}")
+    if key is not None:
+        keys = [key(x) for x in keys]
+    order = array('l', range(len(keys)))
+    if algorithm == "merge":
+        return _merge_argsort(keys, order)
+    if algorithm == "heap":
+        _heap_argsort_range(keys, order, 0, len(order))
+        return order
+    return _quick_argsort(keys, order)
+
+
+def argsort_lex(columns, algorithm="merge"):
+    """
+    Argsort lessicografico su più colonne (la prima è la chiave primaria).
+    - "merge": passate stabili dall'ultima colonna alla prima (stile radix LSD),
+      senza costruire tuple;
+    - "heap"/"quick": una passata su tuple (col0[i], col1[i], ...).
+    """
+    if not columns:
+        return array('l')
+    n = len(columns[0])
+    if any(len(col) != n for col in columns):
+        raise ValueError("le colonne devono avere la stessa lunghezza")
+    if algorithm == "merge":
+        order = array('l', range(n))
+        for col in reversed(columns):
+            order = _merge_argsort(col, order)
+        return order
+    return argsort(list(zip(*columns)), algorithm)
+
+
+def take(seq, order):
+    """ Riordina seq secondo la permutazione order (es. ritornata da argsort). """
+    return [seq[i] for i in order]
+
+
+# ========================================
+# 5. EXTERNAL MERGE SORT (dati più grandi della RAM)
+# ========================================
+# Memoria (byte stimati con sys.getsizeof) occupata da un chunk in RAM
+EXTERNAL_MEMORY_BUDGET = 64 * 1024 * 1024
+# Numero massimo di run fuse in una sola passata (file aperti insieme)
+EXTERNAL_FAN_IN = 64
+# Buffer per l'I/O sequenziale su run e file
+EXTERNAL_BUFFER_SIZE = 1 << 20
+# Record serializzati per ogni chiamata a pickle.dump
+EXTERNAL_BATCH = 1024
+
+
+def _read_records(source, buffer_size):
+    """
+    Sorgente dei record:
+    - percorso di file: una riga per record (bytes, senza terminatore),
+    - qualunque altro iterabile: i suoi elementi.
+    """
+    if isinstance(source, (str, bytes, os.PathLike)):
+        with open(source, "rb", buffering=buffer_size) as f:
+            for line in f:
+                yield line[:-1] if line.endswith(b"\n") else line
+    else:
+        yield from source
+
+
+def _read_chunks(records, memory_budget):
+    """ Raggruppa i record in chunk che stanno nel budget di memoria. """
+    chunk = []
+    used = 0
+    for r in records:
+        chunk.append(r)
+        used += sys.getsizeof(r) + 8  # record + riferimento nella lista
+        if used >= memory_budget:
+            yield chunk
+            chunk = []
+            used = 0
+    if chunk:
+        yield chunk
+
+
+def _write_run(records, tmp_dir, buffer_size):
+    """ Scrive una run ordinata su un file temporaneo, a blocchi di record. """
+    fd, path = tempfile.mkstemp(prefix="run_", suffix=".bin", dir=tmp_dir)
+    with os.fdopen(fd, "wb", buffering=buffer_size) as f:
+        batch = []
+        for r in records:
+            batch.append(r)
+            if len(batch) == EXTERNAL_BATCH:
+                pickle.dump(batch, f, pickle.HIGHEST_PROTOCOL)
+                batch = []
+        if batch:
+            pickle.dump(batch, f, pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+def _sort_and_spill(chunk, key, tmp_dir, buffer_size):
+    """ Ordina un chunk in memoria (sort stabile di list) e lo scrive come run. """
+    chunk.sort(key=key)
+    return _write_run(chunk, tmp_dir, buffer_size)
+
+
+def _read_run(path, buffer_size):
+    """ Rilegge in streaming una run scritta da _write_run. """
+    with open(path, "rb", buffering=buffer_size) as f:
+        while True:
+            try:
+                batch = pickle.load(f)
+            except EOFError:
+                return
+            yield from batch
+
+
+def kway_merge(iterables, key=None):
+    """
+    Merge a k vie di sequenze ordinate tramite min-heap (come merge, ma con k liste).
+    Nell'heap ci sono triple (chiave, indice sorgente, record): a parità di chiave
+    vince la sorgente con indice minore, quindi il merge è stabile.
+    Complessità: O(N log k), N = numero totale di record.
+    """
+    heap = []
+    iterators = [iter(it) for it in iterables]
+    for i, it in enumerate(iterators):
+        for r in it:
+            heap.append((r if key is None else key(r), i, r))
+            break
+    heapq.heapify(heap)
+
+    while heap:
+        _, i, r = heap[0]
+        yield r
+        for nxt in iterators[i]:
+            heapq.heapreplace(heap, (nxt if key is None else key(nxt), i, nxt))
+            break
+        else:
+            heapq.heappop(heap)
+
+
+def _external_sort_iter(source, key, memory_budget, fan_in, buffer_size, tmp_dir):
+    """ Generatore che esegue le fasi di external_sort (vedi sotto). """
+    chunks = _read_chunks(_read_records(source, buffer_size), memory_budget)
+    first = next(chunks, None)
+    if first is None:
+        return
+    second = next(chunks, None)
+    if second is None:
+        # tutto in un chunk: nessun file temporaneo
+        first.sort(key=key)
+        yield from first
+        return
+
+    with tempfile.TemporaryDirectory(prefix="extsort_", dir=tmp_dir) as work_dir:
+        # Fase 1: run ordinate in memoria e riversate su disco
+        runs = [_sort_and_spill(first, key, work_dir, buffer_size),
+                _sort_and_spill(second, key, work_dir, buffer_size)]
+        first = second = None  # libera i primi due chunk
+        for chunk in chunks:
+            runs.append(_sort_and_spill(chunk, key, work_dir, buffer_size))
+
+        # Fase 2: passate intermedie finché le run sono più del fan-in
+        while len(runs) > fan_in:
+            merged_runs = []
+            for g in range(0, len(runs), fan_in):
+                group = runs[g:g + fan_in]
+                sources = [_read_run(path, buffer_size) for path in group]
+                merged_runs.append(
+                    _write_run(kway_merge(sources, key), work_dir, buffer_size))
+                for path in group:
+                    os.remove(path)
+            runs = merged_runs
+
+        # Fase 3: merge finale in streaming
+        yield from kway_merge([_read_run(path, buffer_size) for path in runs], key)
+
+
+def external_sort(source, key=None, output=None,
+                  memory_budget=EXTERNAL_MEMORY_BUDGET, fan_in=EXTERNAL_FAN_IN,
+                  buffer_size=EXTERNAL_BUFFER_SIZE, tmp_dir=None):
+    """
+    External Merge Sort (stabile) per dati che non stanno in memoria.
+    - source: percorso di un file (un record per riga) oppure un iterabile di record
+    - key: funzione chiave, come per sorted()
+    - output: None -> ritorna un iteratore sui record ordinati (streaming);
+              percorso -> scrive i record (bytes o str), uno per riga, e lo ritorna
+    - memory_budget: byte stimati per chunk in memoria
+    - fan_in: massimo numero di run fuse insieme (oltre servono più passate)
+    - buffer_size: buffer per l'I/O sequenziale
+    - tmp_dir: cartella per i file temporanei (default: quella di sistema)
+    Fasi:
+      1) legge chunk da memory_budget, li ordina in RAM e li scrive come run,
+      2) se le run sono più di fan_in le fonde a gruppi (merge multi-passata),
+      3) merge finale a k vie con min-heap (kway_merge).
+    Complessità: O(N log N) confronti, O(N * passate) I/O sequenziale.
+    I file temporanei vengono rimossi a fine iterazione.
+    """
+    if fan_in < 2:
+        raise ValueError("fan_in deve essere almeno 2")
+    records = _external_sort_iter(source, key, memory_budget, fan_in,
+                                  buffer_size, tmp_dir)
+    if output is None:
+        return records
+
+    with open(output, "wb", buffering=buffer_size) as out:
+        for r in records:
+            out.write(r if isinstance(r, bytes) else str(r).encode())
+            out.write(b"\n")
+    return output
+
+
 # ========================================
 # ESEMPIO DI UTILIZZO
 # ========================================
@@ -152,16 +1637,37 @@ if __name__ == "__main__":
     # Ricerca lineare
     print("Linear Search (22):", linear_search(data, 22))
     print("Linear Search (100):", linear_search(data, 100))
+    print("Linear Search su record (offset):", linear_search_file(b"64\n34\n25\n34\n", b"34"))
+    # primo record vuoto, ultimo senza delimitatore finale
+    assert linear_search_file(b"\n34", b"34") == [1]
+    assert linear_search_file(b"\n34", [b"%d" % i for i in range(40)]) == [1]
 
     # Ricerca binaria (serve array ordinato!)
     sorted_data = sorted(data)
     print("Array ordinato:", sorted_data)
     print("Binary Search (25):", binary_search(sorted_data, 25))
     print("Binary Search (100):", binary_search(sorted_data, 100))
+    print("Binary Search multipla:", binary_search_many(sorted_data, [90, 5, 25]).tolist())
+    print("Lower/Upper bound (25):", lower_bound(sorted_data, 25), upper_bound(sorted_data, 25))
+    stats = {}
+    print("Search auto (64):", search(sorted_data, 64, stats=stats), stats)
+    print("Exponential su sorgente lazy:", exponential_search(LazySequence(range(0, 10**9, 3)), 300))
+    index = StaticSearchIndex(sorted_data)
+    print("Indice Eytzinger (25):", index.search(25), "- valori in [20, 70):", index.count_range(20, 70))
 
     # Merge Sort
     print("Merge Sort:", merge_sort(data.copy()))
+    print("Merge Sort adattivo:", merge_sort(data.copy(), adaptive=True))
+    print("Merge Sort bottom-up:", merge_sort_inplace(data.copy()))
 
     # Heap Sort
     print("Heap Sort:", heap_sort(data.copy()))
+    print("Heap Sort 4-ario:", heap_sort_dary(data.copy(), arity=4))
+
+    # Argsort: permutazione che ordina, i dati restano dove sono
+    order = argsort(data)
+    print("Argsort:", order.tolist(), "->", take(data, order))
+
+    # External Merge Sort (budget minuscolo per forzare run su disco)
+    print("External Sort:", list(external_sort(data, memory_budget=64, fan_in=2)))
 
@@ -8,29 +8,55 @@
 # Prof. Andrea Cigliano
 # =================================================
 
-from collections import deque, defaultdict
+from collections import deque, defaultdict, OrderedDict
+from collections.abc import Mapping
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 import math
 import heapq
+import multiprocessing
+import os
+import pickle
+import random
+import sys
+import time
+import tracemalloc
+from types import MappingProxyType
+
+try:
+    import numpy as np  # opzionale: usato solo da floyd_warshall_matrix
+except ImportError:
+    np = None
+
 
 # ============================================================
 # Rappresentazione consigliata del grafo pesato:
 # graph[u][v] = peso dell'arco u->v  (dizionario di dizionari)
 # Per BFS/DFS (non pesati) si può usare graph_simple[u] = [v1, v2, ...]
+# Per grafi molto grandi: CSRGraph (array compatti, nodi = interi 0..n-1),
+# accettato da tutti gli algoritmi qui sotto (vedi sezione CSR).
 # ============================================================
 
 
 # ------------------------------------------------------------
 # DIJKSTRA: cammini minimi da una sorgente con pesi NON negativi
 # ------------------------------------------------------------
-def dijkstra(graph, source):
+def dijkstra(graph, source, target=None):
     """
     graph: dict[str, dict[str, float]]  es. graph['A']['B'] = 3.5
     source: nodo sorgente
+    target: (opzionale) si ferma appena target viene estratto dalla coda:
+            dist[target] e il cammino verso target sono definitivi,
+            le distanze degli altri nodi possono essere solo provvisorie.
     Ritorna:
       dist:  dict nodo -> distanza minima da source
       prev:  dict nodo -> predecessore sul cammino minimo (per ricostruire il path)
     Complessità: O((V+E) log V) con min-heap
+    Con un CSRGraph: dist array('d') e prev array('l') indicizzati per id (-1 = nessuno).
     """
+    if isinstance(graph, CSRGraph):
+        return _dijkstra_csr(graph, source, target)
+
     dist = {u: math.inf for u in graph}
     prev = {u: None for u in graph}
     dist[source] = 0.0
@@ -44,6 +70,8 @@ def dijkstra(graph, source):
         if u in visited:
             continue
         visited.add(u)
+        if u == target:
+            break  # early termination: target definitivo
 
         # Se il nodo non ha uscenti, .get evita KeyError
         for v, w in graph.get(u, {}).items():
@@ -58,20 +86,524 @@ def dijkstra(graph, source):
     return dist, prev
 
 
+def reconstruct_path(prev, source, target):
+    """
+    Ricostruisce il cammino source->target risalendo 'prev' (di dijkstra & co.).
+    Funziona sia con prev dict (None = nessun predecessore) sia con prev array
+    della versione CSR (-1 = nessuno; source e target sono allora id interi).
+    Ritorna lista di nodi [source, ..., target] oppure [] se non raggiungibile.
+    """
+    none = None if isinstance(prev, dict) else -1
+    path = [target]
+    u = target
+    while u != source:
+        u = prev[u]
+        if u == none:
+            return []
+        path.append(u)
+    path.reverse()
+    return path
+
+
+def reverse_graph(graph):
+    """ Grafo con gli archi invertiti: rev[v][u] = graph[u][v]. """
+    rev = {u: {} for u in graph}
+    for u, nbrs in graph.items():
+        for v, w in nbrs.items():
+            rev.setdefault(v, {})[u] = w
+    return rev
+
+
+# ------------------------------------------------------------
+# DIJKSTRA BIDIREZIONALE: cammino minimo tra due nodi
+# ------------------------------------------------------------
+def bidirectional_dijkstra(graph, source, target, reverse=None, stats=None):
+    """
+    graph: dict[str, dict[str, float]] (pesi non negativi)
+    reverse: grafo inverso (reverse_graph(graph)); conviene precalcolarlo una volta
+             se si fanno molte query, altrimenti viene costruito qui
+    stats: dict opzionale, riceve "settled" (nodi estratti in totale)
+    Due ricerche alternate: in avanti da source su graph, all'indietro da target
+    sul grafo inverso. mu = miglior cammino visto passando da un arco che collega
+    le due ricerche; ci si ferma appena top(avanti) + top(indietro) >= mu,
+    perché nessun cammino non ancora visto può fare meglio.
+    Ritorna (distanza, cammino) oppure (inf, []) se target non è raggiungibile.
+    Su grafi "stradali" esplora circa due palle di raggio d/2 invece di una di raggio d.
+    """
+    if source == target:
+        return 0.0, [source]
+    if reverse is None:
+        reverse = reverse_graph(graph)
+
+    # indice 0 = ricerca in avanti, 1 = ricerca all'indietro
+    graphs = (graph, reverse)
+    dist = ({source: 0.0}, {target: 0.0})
+    prev = ({source: None}, {target: None})
+    done = (set(), set())
+    pq = ([(0.0, source)], [(0.0, target)])
+    mu = math.inf
+    meet = None
+    settled = 0
+
+    while pq[0] and pq[1]:
+        if pq[0][0][0] + pq[1][0][0] >= mu:
+            break  # criterio di arresto standard
+        side = 0 if pq[0][0][0] <= pq[1][0][0] else 1
+        d, u = heapq.heappop(pq[side])
+        if u in done[side]:
+            continue
+        done[side].add(u)
+        settled += 1
+
+        other_dist = dist[1 - side]
+        for v, w in graphs[side].get(u, {}).items():
+            if w < 0:
+                raise ValueError("Dijkstra richiede pesi non negativi.")
+            nd = d + w
+            if nd < dist[side].get(v, math.inf):
+                dist[side][v] = nd
+                prev[side][v] = u
+                heapq.heappush(pq[side], (nd, v))
+            # arco che collega le due ricerche: possibile nuovo miglior cammino
+            if v in other_dist and nd + other_dist[v] < mu:
+                mu = nd + other_dist[v]
+                meet = v
+
+    if stats is not None:
+        stats["settled"] = settled
+    if meet is None:
+        return math.inf, []
+
+    # source -> meet con prev in avanti, meet -> target con prev all'indietro
+    path = reconstruct_path(prev[0], source, meet)
+    u = prev[1][meet]
+    while u is not None:
+        path.append(u)
+        u = prev[1][u]
+    return mu, path
+
+
+# ------------------------------------------------------------
+# A*: cammino minimo guidato da un'euristica
+# ------------------------------------------------------------
+def astar(graph, source, target, heuristic, stats=None):
+    """
+    graph: dict[str, dict[str, float]] (pesi non negativi)
+    heuristic(u, target): stima per difetto della distanza u -> target
+                          (ammissibile e consistente, es. le funzioni *_heuristic
+                          qui sotto oppure un oggetto ALTLandmarks)
+    stats: dict opzionale, riceve "settled" (nodi estratti)
+    Come Dijkstra, ma la coda è ordinata per f = g + h: vengono estratti prima
+    i nodi "nella direzione giusta". Con h = 0 coincide con dijkstra(target=...).
+    Ritorna (distanza, cammino) oppure (inf, []) se target non è raggiungibile.
+    """
+    g = {source: 0.0}
+    prev = {source: None}
+    closed = set()
+    pq = [(heuristic(source, target), 0.0, source)]
+
+    while pq:
+        _, d, u = heapq.heappop(pq)
+        if u in closed:
+            continue
+        closed.add(u)
+        if u == target:
+            if stats is not None:
+                stats["settled"] = len(closed)
+            return d, reconstruct_path(prev, source, target)
+
+        for v, w in graph.get(u, {}).items():
+            if w < 0:
+                raise ValueError("A* richiede pesi non negativi.")
+            nd = d + w
+            if nd < g.get(v, math.inf):
+                g[v] = nd
+                prev[v] = u
+                heapq.heappush(pq, (nd + heuristic(v, target), nd, v))
+
+    if stats is not None:
+        stats["settled"] = len(closed)
+    return math.inf, []
+
+
+def euclidean_heuristic(coords):
+    """ h(u, v) = distanza euclidea tra coords[u] = (x, y) e coords[v]. """
+    def h(u, v):
+        (x1, y1), (x2, y2) = coords[u], coords[v]
+        return math.hypot(x1 - x2, y1 - y2)
+    return h
+
+
+def manhattan_heuristic(coords):
+    """ h(u, v) = |x1 - x2| + |y1 - y2| (griglie con soli spostamenti assiali). """
+    def h(u, v):
+        (x1, y1), (x2, y2) = coords[u], coords[v]
+        return abs(x1 - x2) + abs(y1 - y2)
+    return h
+
+
+def haversine_heuristic(coords, radius=6371.0):
+    """
+    h(u, v) = distanza ortodromica tra coords[u] = (lat, lon) e coords[v], in gradi.
+    radius: raggio terrestre nell'unità dei pesi (default km).
+    """
+    def h(u, v):
+        lat1, lon1 = map(math.radians, coords[u])
+        lat2, lon2 = map(math.radians, coords[v])
+        a = (math.sin((lat2 - lat1) / 2) ** 2
+             + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2)
+        return 2 * radius * math.asin(min(1.0, math.sqrt(a)))
+    return h
+
+
+class ALTLandmarks:
+    """
+    Euristica ALT (A*, Landmarks, Triangle inequality).
+    Preprocessing: per pochi landmark L si calcolano con dijkstra d(L, u) sul grafo
+    e d(u, L) sul grafo inverso, per ogni nodo u. In query, per la disuguaglianza
+    triangolare:
+        d(u, t) >= d(L, t) - d(L, u)    e    d(u, t) >= d(u, L) - d(t, L)
+    il massimo su tutti i landmark è una stima ammissibile e consistente.
+    Le tabelle sono due array('d') piatti (landmark x nodi) e si salvano su file,
+    così il preprocessing non si ripete a ogni avvio. L'oggetto si usa
+    direttamente come euristica: astar(graph, s, t, alt).
+    """
+    def __init__(self, nodes, landmarks, dist_from, dist_to):
+        self.nodes = list(nodes)
+        self.index = {u: i for i, u in enumerate(self.nodes)}
+        self.landmarks = list(landmarks)
+        self.dist_from = dist_from   # dist_from[l * n + i] = d(L_l, nodo i)
+        self.dist_to = dist_to       # dist_to[l * n + i]   = d(nodo i, L_l)
+
+    @classmethod
+    def preprocess(cls, graph, k=8, landmarks=None, seed=0):
+        """
+        Sceglie k landmark (se non dati) con la strategia "farthest": ogni nuovo
+        landmark è il nodo raggiungibile più lontano da quelli già scelti.
+        Costo: 2k esecuzioni complete di dijkstra (le distanze calcolate per
+        la scelta diventano direttamente la tabella dist_from).
+        """
+        reverse = reverse_graph(graph)
+        nodes = list(reverse)   # include anche i nodi senza archi uscenti
+        n = len(nodes)
+
+        dist_from = array('d')
+        if landmarks is None:
+            landmarks = []
+            nearest = {u: math.inf for u in nodes}
+            current = random.Random(seed).choice(nodes)
+            for _ in range(min(k, n)):
+                landmarks.append(current)
+                d_from, _ = dijkstra(graph, current)
+                dist_from.extend(d_from.get(u, math.inf) for u in nodes)
+                for u in nodes:
+                    nearest[u] = min(nearest[u], d_from.get(u, math.inf))
+                reachable = [u for u in nodes
+                             if nearest[u] != math.inf and u not in landmarks]
+                if not reachable:
+                    break
+                current = max(reachable, key=nearest.__getitem__)
+        else:
+            for L in landmarks:
+                d_from, _ = dijkstra(graph, L)
+                dist_from.extend(d_from.get(u, math.inf) for u in nodes)
+
+        dist_to = array('d')
+        for L in landmarks:
+            d_to, _ = dijkstra(reverse, L)
+            dist_to.extend(d_to.get(u, math.inf) for u in nodes)
+        return cls(nodes, landmarks, dist_from, dist_to)
+
+    def __call__(self, u, t):
+        n = len(self.nodes)
+        iu, it = self.index[u], self.index[t]
+        best = 0.0
+        for base in range(0, len(self.landmarks) * n, n):
+            lu, lt = self.dist_from[base + iu], self.dist_from[base + it]
+            if lt != math.inf and lu != math.inf and lt - lu > best:
+                best = lt - lu
+            ul, tl = self.dist_to[base + iu], self.dist_to[base + it]
+            if ul != math.inf and tl != math.inf and ul - tl > best:
+                best = ul - tl
+        return best
+
+    def save(self, path):
+        """ Salva nodi, landmark e tabelle (gli array si serializzano come byte grezzi). """
+        with open(path, "wb") as f:
+            pickle.dump({"nodes": self.nodes, "landmarks": self.landmarks,
+                         "dist_from": self.dist_from, "dist_to": self.dist_to},
+                        f, pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        return cls(data["nodes"], data["landmarks"], data["dist_from"], data["dist_to"])
+
+
+# ------------------------------------------------------------
+# CONTRACTION HIERARCHIES: preprocessing per query ripetute
+# ------------------------------------------------------------
+class ContractionHierarchy:
+    """
+    Contraction Hierarchies su grafo statico (pesi non negativi).
+    Preprocessing: i nodi vengono "contratti" uno alla volta in ordine di
+    importanza crescente (edge difference = scorciatoie aggiunte - archi rimossi
+    + vicini già contratti). Contrarre v significa: per ogni coppia u -> v -> x
+    si aggiunge la scorciatoia u -> x di peso w(u,v) + w(v,x), a meno che una
+    ricerca locale ("witness search") trovi un cammino alternativo non più lungo.
+    Query: Dijkstra bidirezionale che sale soltanto verso nodi di rango maggiore,
+    quindi esplora poche centinaia di nodi anche su grafi stradali grandi.
+    Ogni scorciatoia ricorda il nodo intermedio, così il cammino si "srotola"
+    fino agli archi originali.
+    Il grafo risultante sta in due strutture CSR (archi in salita in avanti e
+    all'indietro) di array compatti, salvabili con save/load.
+    """
+    def __init__(self, labels, rank, fwd, bwd):
+        self.labels = list(labels)
+        self.index = {u: i for i, u in enumerate(self.labels)}
+        self.rank = rank   # rank[i] = ordine di contrazione del nodo i
+        self.fwd = fwd     # (indptr, indices, weights, middle): u -> x con rank[x] > rank[u]
+        self.bwd = bwd     # (indptr, indices, weights, middle): x -> t con rank[x] > rank[t]
+
+    @classmethod
+    def build(cls, graph, witness_limit=500):
+        """
+        graph: dict[str, dict[str, float]] (formato di dijkstra)
+        witness_limit: massimo numero di nodi estratti da ogni witness search;
+                       se la ricerca si interrompe si aggiunge la scorciatoia
+                       (sempre corretto, al più qualche arco in più).
+        """
+        labels = list(reverse_graph(graph))
+        index = {u: i for i, u in enumerate(labels)}
+        n = len(labels)
+        out = [dict() for _ in range(n)]
+        inc = [dict() for _ in range(n)]
+        for u, nbrs in graph.items():
+            for v, w in nbrs.items():
+                if w < 0:
+                    raise ValueError("Contraction Hierarchies richiede pesi non negativi.")
+                iu, iv = index[u], index[v]
+                if iu != iv and w < out[iu].get(iv, math.inf):
+                    out[iu][iv] = w
+                    inc[iv][iu] = w
+
+        middle = {}                    # (u, x) -> nodo intermedio della scorciatoia
+        contracted = bytearray(n)
+        deleted = [0] * n              # vicini già contratti
+        up_out = [None] * n
+        up_in = [None] * n
+        rank = array('i', [0]) * n
+
+        def shortcuts(v):
+            result = []
+            for u, w_uv in inc[v].items():
+                targets = [(x, w_uv + w_vx) for x, w_vx in out[v].items() if x != u]
+                if not targets:
+                    continue
+                limit = max(c for _, c in targets)
+                # witness search da u che evita v, limitata in costo e in nodi;
+                # si ferma appena tutti i target sono stati estratti
+                pending = {x for x, _ in targets}
+                dist = {u: 0.0}
+                pq = [(0.0, u)]
+                settled = 0
+                while pq and pending and settled < witness_limit:
+                    d, a = heapq.heappop(pq)
+                    if d > dist[a]:
+                        continue
+                    if d > limit:
+                        break
+                    settled += 1
+                    pending.discard(a)
+                    for b, w in out[a].items():
+                        nd = d + w
+                        if b != v and nd < dist.get(b, math.inf):
+                            dist[b] = nd
+                            heapq.heappush(pq, (nd, b))
+                for x, c in targets:
+                    if dist.get(x, math.inf) > c:
+                        result.append((u, x, c))
+            return result
+
+        def priority(v):
+            return len(shortcuts(v)) - len(inc[v]) - len(out[v]) + deleted[v]
+
+        # stamp[v] cambia quando cambia l'intorno di v: le voci vecchie in coda
+        # vengono scartate, quella valida ha la priorità aggiornata
+        stamp = [0] * n
+        pq = [(priority(v), v, 0) for v in range(n)]
+        heapq.heapify(pq)
+        order = 0
+        while pq:
+            _, v, st = heapq.heappop(pq)
+            if contracted[v] or st != stamp[v]:
+                continue
+
+            for u, x, c in shortcuts(v):
+                if c < out[u].get(x, math.inf):
+                    out[u][x] = c
+                    inc[x][u] = c
+                    middle[(u, x)] = v
+            up_out[v] = out[v]
+            up_in[v] = inc[v]
+            for x in out[v]:
+                del inc[x][v]
+            for u in inc[v]:
+                del out[u][v]
+            out[v] = inc[v] = None
+            contracted[v] = 1
+            rank[v] = order
+            order += 1
+            # i vicini hanno perso un arco (e forse guadagnato scorciatoie):
+            # la loro priorità va ricalcolata
+            for x in set(up_out[v]) | set(up_in[v]):
+                deleted[x] += 1
+                stamp[x] += 1
+                heapq.heappush(pq, (priority(x), x, stamp[x]))
+
+        def pack(adj, mid):
+            indptr = array('i', [0])
+            indices, weights, mids = array('i'), array('d'), array('i')
+            for v in range(n):
+                for x, w in adj[v].items():
+                    indices.append(x)
+                    weights.append(w)
+                    mids.append(mid(v, x))
+                indptr.append(len(indices))
+            return indptr, indices, weights, mids
+
+        fwd = pack(up_out, lambda u, x: middle.get((u, x), -1))
+        bwd = pack(up_in, lambda t, x: middle.get((x, t), -1))
+        return cls(labels, rank, fwd, bwd)
+
+    @property
+    def num_shortcuts(self):
+        return sum(1 for m in self.fwd[3] if m >= 0) + sum(1 for m in self.bwd[3] if m >= 0)
+
+    def _search(self, side, dist, prev, pq):
+        """ Estrae un nodo dalla coda di una delle due ricerche in salita. """
+        indptr, indices, weights, _ = side
+        d, u = heapq.heappop(pq)
+        if d > dist[u]:
+            return
+        for e in range(indptr[u], indptr[u + 1]):
+            v = indices[e]
+            nd = d + weights[e]
+            if nd < dist.get(v, math.inf):
+                dist[v] = nd
+                prev[v] = u
+                heapq.heappush(pq, (nd, v))
+
+    def _unpack(self, u, x, path):
+        """ Sostituisce ricorsivamente (con uno stack) la scorciatoia u -> x con archi originali. """
+        stack = [(u, x)]
+        while stack:
+            a, b = stack.pop()
+            if self.rank[b] > self.rank[a]:
+                indptr, indices, _, mids = self.fwd
+                row, other = a, b
+            else:
+                indptr, indices, _, mids = self.bwd
+                row, other = b, a
+            mid = -1
+            for e in range(indptr[row], indptr[row + 1]):
+                if indices[e] == other:
+                    mid = mids[e]
+                    break
+            if mid < 0:
+                path.append(b)
+            else:
+                stack.append((mid, b))
+                stack.append((a, mid))
+
+    def query(self, source, target, stats=None):
+        """
+        Ritorna (distanza, cammino) come bidirectional_dijkstra, cammino sugli
+        archi originali. Le due ricerche salgono nella gerarchia; si fermano
+        quando il minimo di entrambe le code supera il miglior incontro.
+        """
+        s, t = self.index[source], self.index[target]
+        dist_f, dist_b = {s: 0.0}, {t: 0.0}
+        prev_f, prev_b = {s: -1}, {t: -1}
+        pq_f, pq_b = [(0.0, s)], [(0.0, t)]
+        best, meet = (0.0, s) if s == t else (math.inf, -1)
+        settled = 0
+
+        while pq_f or pq_b:
+            if pq_f and pq_f[0][0] < best:
+                u = pq_f[0][1]
+                self._search(self.fwd, dist_f, prev_f, pq_f)
+                settled += 1
+                if u in dist_b and dist_f[u] + dist_b[u] < best:
+                    best, meet = dist_f[u] + dist_b[u], u
+            else:
+                pq_f = []
+            if pq_b and pq_b[0][0] < best:
+                u = pq_b[0][1]
+                self._search(self.bwd, dist_b, prev_b, pq_b)
+                settled += 1
+                if u in dist_f and dist_f[u] + dist_b[u] < best:
+                    best, meet = dist_f[u] + dist_b[u], u
+            else:
+                pq_b = []
+
+        if stats is not None:
+            stats["settled"] = settled
+        if meet < 0:
+            return math.inf, []
+
+        up = [meet]
+        while prev_f[up[-1]] != -1:
+            up.append(prev_f[up[-1]])
+        up.reverse()
+        down = [meet]
+        while prev_b[down[-1]] != -1:
+            down.append(prev_b[down[-1]])
+        hops = up + down[1:]
+
+        path = [s]
+        for a, b in zip(hops, hops[1:]):
+            self._unpack(a, b, path)
+        return best, [self.labels[i] for i in path]
+
+    def save(self, path):
+        """ Salva etichette, rank e le due CSR (gli array si serializzano come byte grezzi). """
+        with open(path, "wb") as f:
+            pickle.dump({"labels": self.labels, "rank": self.rank,
+                         "fwd": self.fwd, "bwd": self.bwd},
+                        f, pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        return cls(data["labels"], data["rank"], data["fwd"], data["bwd"])
+
+
 # ------------------------------------------------------------
 # BELLMAN–FORD: cammini minimi con pesi anche negativi
 #                e rilevazione di cicli negativi raggiungibili
 # ------------------------------------------------------------
-def bellman_ford(graph, source):
+def bellman_ford(graph, source, queue=False):
     """
     graph: dict[str, dict[str, float]]
     source: nodo sorgente
+    queue: se True usa la variante a coda (spfa), che rilassa solo gli archi
+           dei nodi la cui distanza è cambiata
     Ritorna:
       dist: dict nodo -> distanza minima
       prev: dict nodo -> predecessore
       has_negative_cycle: bool (True se esiste ciclo negativo raggiungibile)
     Complessità: O(V * E)
+    Con un CSRGraph: dist array('d') e prev array('l') indicizzati per id (-1 = nessuno).
     """
+    if queue:
+        dist, prev, cycle = spfa(graph, source)
+        return dist, prev, bool(cycle)
+    if isinstance(graph, CSRGraph):
+        return _bellman_ford_csr(graph, source)
+
     # Costruisco lista nodi e lista archi
     nodes = set(graph.keys())
     for u in graph:
@@ -108,6 +640,123 @@ def bellman_ford(graph, source):
     return dist, prev, has_negative_cycle
 
 
+# ------------------------------------------------------------
+# SPFA: Bellman–Ford a coda, con estrazione del ciclo negativo
+# ------------------------------------------------------------
+def _prev_cycle(prev, starts, none):
+    """
+    Cerca un ciclo nel grafo dei predecessori seguendo prev a partire da starts
+    (ogni nodo visitato una volta sola: O(V)). Ritorna il ciclo in ordine di
+    percorrenza [c0, c1, ..., ck] (archi ci -> ci+1 e ck -> c0) oppure [].
+    """
+    state = {}   # 1 = nel cammino corrente, 2 = già esplorato
+    for u in starts:
+        walk = []
+        while u != none and u not in state:
+            state[u] = 1
+            walk.append(u)
+            u = prev[u]
+        if u != none and state[u] == 1:
+            cycle = walk[walk.index(u):]
+            cycle.reverse()
+            return cycle
+        for x in walk:
+            state[x] = 2
+    return []
+
+
+def spfa(graph, source, slf=True, lll=True, stats=None):
+    """
+    Shortest Path Faster Algorithm: Bellman–Ford guidato da una coda.
+    Solo i nodi la cui distanza è appena diminuita entrano in coda, quindi
+    si rilassano gli archi uscenti di quelli e non tutti gli archi a ogni giro.
+    Euristiche sull'ordine della coda (deque):
+      - SLF (Small Label First): un nodo con distanza minore di quella in testa
+        entra in testa invece che in coda;
+      - LLL (Large Label Last): finché il nodo in testa ha distanza sopra la
+        media dei nodi in coda, viene spostato in fondo.
+    Ogni nodo ha un contatore di inserimenti in coda: se arriva a V esiste un
+    ciclo negativo raggiungibile, che viene cercato seguendo prev (qualunque
+    ciclo nel grafo dei predecessori ha peso negativo).
+    stats: dict opzionale, riceve "pops" e "relaxations".
+    Ritorna (dist, prev, cycle): cycle = [] oppure i nodi del ciclo negativo
+    in ordine di percorrenza (l'ultimo torna al primo).
+    Con un CSRGraph: dist array('d'), prev array('l'), nodi e ciclo come id (-1 = nessuno).
+    Complessità: O(V * E) nel caso pessimo, di solito molto meno.
+    """
+    if isinstance(graph, CSRGraph):
+        n = graph.n
+        nodes = range(n)
+        s = graph.index[source]
+        dist = array('d', [math.inf]) * n
+        prev = array('l', [-1]) * n
+        in_queue = bytearray(n)
+        count = array('l', [0]) * n
+        none = -1
+        adj = graph.neighbors
+    else:
+        nodes = set(graph.keys())
+        for u in graph:
+            nodes.update(graph[u].keys())
+        n = len(nodes)
+        s = source
+        dist = {u: math.inf for u in nodes}
+        prev = {u: None for u in nodes}
+        in_queue = {u: False for u in nodes}
+        count = {u: 0 for u in nodes}
+        none = None
+        adj = lambda u: graph.get(u, {}).items()
+
+    dist[s] = 0.0
+    q = deque([s])
+    in_queue[s] = True
+    total = 0.0          # somma delle distanze dei nodi in coda (per LLL)
+    pops = relaxations = 0
+    cycle = []
+
+    while q:
+        if lll:
+            avg = total / len(q)
+            for _ in range(len(q) - 1):
+                if dist[q[0]] <= avg:
+                    break
+                q.rotate(-1)
+        u = q.popleft()
+        in_queue[u] = False
+        total -= dist[u]
+        pops += 1
+
+        du = dist[u]
+        for v, w in adj(u):
+            nd = du + w
+            if nd < dist[v]:
+                relaxations += 1
+                if in_queue[v]:
+                    total += nd - dist[v]
+                dist[v] = nd
+                prev[v] = u
+                if in_queue[v]:
+                    continue
+                count[v] += 1
+                if count[v] >= n:
+                    cycle = _prev_cycle(prev, [v], none) or _prev_cycle(prev, nodes, none)
+                    if cycle:
+                        q.clear()
+                        break
+                    count[v] = 0   # nessun ciclo ancora visibile in prev: si riprova più avanti
+                in_queue[v] = True
+                total += nd
+                if slf and q and nd < dist[q[0]]:
+                    q.appendleft(v)
+                else:
+                    q.append(v)
+
+    if stats is not None:
+        stats["pops"] = pops
+        stats["relaxations"] = relaxations
+    return dist, prev, cycle
+
+
 # ------------------------------------------------------------
 # FLOYD–WARSHALL: tutte le coppie di cammini minimi
 #                 supporta pesi negativi (ma non cicli negativi)
@@ -119,7 +768,11 @@ def floyd_warshall(graph):
       dist[u][v]: distanza minima da u a v
       nxt[u][v]:  prossimo nodo dopo u sul cammino minimo verso v (per ricostruzione)
     Complessità: O(V^3), Spazio: O(V^2)
+    Con un CSRGraph: righe array('d') / array('l') indicizzate per id (-1 = nessuno).
     """
+    if isinstance(graph, CSRGraph):
+        return _floyd_warshall_csr(graph)
+
     # Insieme nodi
     nodes = set(graph.keys())
     for u in graph:
@@ -155,8 +808,7 @@ def floyd_warshall(graph):
                     dist[i][j] = nd
                     nxt[i][j] = nxt[i][k]
 
-    # Facoltativo: controllo cicli negativi (dist[u][u] < 0)
-    # Se serve agire, qui si potrebbe marcare coppie coinvolte.
+    # Cicli negativi: dist[u][u] < 0 (vedi fw_negative_cycle_nodes)
     return dist, nxt
 
 
@@ -164,28 +816,236 @@ def reconstruct_path_fw(nxt, u, v):
     """
     Ricostruisce il cammino u->v usando 'nxt' di Floyd–Warshall.
     Ritorna lista di nodi [u, ..., v] oppure [] se non esiste.
+    Con le matrici a indici (CSRGraph, floyd_warshall_matrix) u e v sono id interi.
     """
-    if nxt.get(u, {}).get(v) is None:
-        return []
+    if isinstance(nxt, dict):
+        if nxt.get(u, {}).get(v) is None:
+            return []
+        step = lambda a: nxt[a][v]
+    else:
+        if nxt[u][v] < 0:
+            return []
+        step = lambda a: int(nxt[a][v])
     path = [u]
     while u != v:
-        u = nxt[u][v]
+        u = step(u)
         path.append(u)
     return path
 
 
+def fw_negative_cycle_nodes(dist):
+    """
+    Nodi su un ciclo negativo (o che lo raggiungono e ne tornano): dist[u][u] < 0.
+    dist: matrice di floyd_warshall (dict di dict oppure righe per id) o di
+    floyd_warshall_matrix (ndarray). Lista vuota = nessun ciclo negativo.
+    """
+    if isinstance(dist, dict):
+        return [u for u in dist if dist[u][u] < 0]
+    if np is not None and isinstance(dist, np.ndarray):
+        return np.flatnonzero(np.diagonal(dist) < 0).tolist()
+    return [u for u in range(len(dist)) if dist[u][u] < 0]
+
+
+def _fw_tile(dist, nxt, rows, cols, ks):
+    """
+    Aggiorna il blocco dist[rows, cols] con gli intermedi k in ks:
+    una operazione vettoriale (broadcast riga x colonna) per ogni k.
+    """
+    D = dist[rows, cols]   # viste: le modifiche finiscono nella matrice
+    N = nxt[rows, cols]
+    cand = np.empty_like(D)            # buffer riusati: niente allocazioni per k
+    better = np.empty(D.shape, dtype=bool)
+    for k in range(ks.start, ks.stop):
+        np.add(dist[rows, k][:, None], dist[k, cols][None, :], out=cand)
+        np.less(cand, D, out=better)
+        if better.any():
+            np.copyto(N, nxt[rows, k][:, None], where=better)
+            np.copyto(D, cand, where=better)
+
+
+def floyd_warshall_matrix(graph, dtype="float64", block=None):
+    """
+    Floyd–Warshall su matrici dense NumPy (grafi densi, migliaia di nodi).
+    graph: dict[str, dict[str, float]] oppure CSRGraph
+    dtype: "float64" oppure "float32" (metà memoria, meno precisione)
+    block: None = un aggiornamento vettoriale dell'intera matrice per ogni k:
+               dist = minimum(dist, dist[:, k, None] + dist[None, k, :]);
+           intero b = variante a blocchi (tiled) b x b: per ogni blocco diagonale
+               1) blocco diagonale, 2) riga e colonna di blocchi, 3) il resto;
+               ogni passo lavora su un blocco che sta in cache.
+    Ritorna (labels, dist, nxt): dist ndarray n x n, nxt ndarray int32 (-1 = nessuno),
+    indicizzati per id come labels; reconstruct_path_fw e fw_negative_cycle_nodes
+    li accettano direttamente.
+    Senza NumPy ripiega su floyd_warshall (CSR): stesse convenzioni, righe array.
+    Complessità: O(V^3) operazioni, ma V^2 per iterazione in codice C. Spazio: O(V^2).
+    """
+    csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_dict(graph)
+    if np is None:
+        dist, nxt = _floyd_warshall_csr(csr)
+        return csr.labels, dist, nxt
+
+    n = csr.n
+    dist = np.full((n, n), np.inf, dtype=dtype)
+    np.fill_diagonal(dist, 0)
+    nxt = np.full((n, n), -1, dtype=np.int32)
+    np.fill_diagonal(nxt, np.arange(n, dtype=np.int32))
+    src = np.repeat(np.arange(n), np.diff(np.asarray(csr.indptr, dtype=np.int64)))
+    dst = np.asarray(csr.indices, dtype=np.int64)
+    np.minimum.at(dist, (src, dst), np.asarray(csr.weights, dtype=dtype))
+    nxt[src, dst] = dst
+
+    everything = slice(0, n)
+    if block is None or block >= n:
+        _fw_tile(dist, nxt, everything, everything, everything)
+        return csr.labels, dist, nxt
+
+    tiles = [slice(lo, min(lo + block, n)) for lo in range(0, n, block)]
+    for K in tiles:
+        _fw_tile(dist, nxt, K, K, K)
+        for T in tiles:
+            if T != K:
+                _fw_tile(dist, nxt, K, T, K)
+                _fw_tile(dist, nxt, T, K, K)
+        for I in tiles:
+            if I == K:
+                continue
+            for J in tiles:
+                if J != K:
+                    _fw_tile(dist, nxt, I, J, K)
+    return csr.labels, dist, nxt
+
+
+# ------------------------------------------------------------
+# JOHNSON: tutte le coppie su grafi sparsi (anche pesi negativi)
+# ------------------------------------------------------------
+_JOHNSON_STATE = None   # (grafo ripesato, potenziali h) del processo worker
+
+
+def _fork_context():
+    """
+    Contesto multiprocessing "fork", o None dove non esiste (Windows).
+    Il file della lezione si carica con importlib (spazi nel nome): con
+    "spawn"/"forkserver" i worker non ritroverebbero il modulo per nome,
+    mentre un fork lo eredita già caricato.
+    """
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return None
+
+
+def _johnson_init(indptr, indices, weights, h):
+    """
+    Initializer del ProcessPoolExecutor: il grafo arriva una sola volta per
+    processo (con fork non viene nemmeno serializzato) e resta in sola lettura.
+    """
+    global _JOHNSON_STATE
+    _JOHNSON_STATE = (CSRGraph(indptr, indices, weights, range(len(h))), h)
+
+
+def _johnson_rows(sources, state=None):
+    """ Worker: una riga di distanze (array('d'), pesi originali) per ogni sorgente. """
+    graph, h = state or _JOHNSON_STATE
+    rows = []
+    for s in sources:
+        dist, _ = _dijkstra_csr(graph, s)
+        hs = h[s]
+        for v in range(len(dist)):
+            if dist[v] != math.inf:
+                dist[v] += h[v] - hs
+        rows.append(dist)
+    return rows
+
+
+def johnson_all_pairs(graph, workers=None, sources=None, stream=False, batch=None):
+    """
+    Cammini minimi fra tutte le coppie (algoritmo di Johnson).
+    graph: dict[str, dict[str, float]] oppure CSRGraph (pesi anche negativi)
+    workers: processi per le esecuzioni di Dijkstra (default os.cpu_count(); 1 = seriale;
+             senza start method "fork", es. su Windows, sempre seriale)
+    sources: sottoinsieme di sorgenti (default: tutti i nodi)
+    stream: se True ritorna un iteratore di coppie (sorgente, riga) invece della matrice
+    batch: sorgenti per task (default: in base a sorgenti e worker)
+    Fasi:
+      1) bellman_ford da una sorgente virtuale collegata a tutti i nodi con peso 0:
+         i potenziali h(u) = dist(u) rendono non negativi i pesi
+         w'(u, v) = w(u, v) + h(u) - h(v) (se c'è un ciclo negativo: ValueError);
+      2) un dijkstra per sorgente sul grafo ripesato (CSR), distribuiti su un
+         ProcessPoolExecutor; il grafo è condiviso tramite l'initializer, ai task
+         passano solo gli id delle sorgenti;
+      3) d(s, v) = d'(s, v) - h(s) + h(v).
+    Ritorna (labels, rows): rows[i] è un array('d') con le distanze da sources[i],
+    indicizzato come labels (come le matrici di floyd_warshall su CSRGraph).
+    In streaming al massimo 2 * workers task sono in volo alla volta.
+    Complessità: O(V * E + V * E log V), contro O(V^3) di Floyd–Warshall.
+    """
+    csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_dict(graph)
+    n, m = csr.n, csr.m
+
+    # 1) Potenziali con Bellman–Ford dal nodo virtuale (id n)
+    virtual = object()
+    indptr = array(csr.indptr.typecode, csr.indptr)
+    indptr.append(m + n)
+    augmented = CSRGraph(indptr, csr.indices + array(csr.indices.typecode, range(n)),
+                         csr.weights + array('d', [0.0]) * n, csr.labels + [virtual])
+    h, _, has_negative_cycle = bellman_ford(augmented, virtual)
+    if has_negative_cycle:
+        raise ValueError("Il grafo contiene un ciclo negativo: Johnson non è applicabile.")
+    h = h[:n]
+
+    # 2) Ripesatura (max(0, ...) assorbe gli errori di arrotondamento)
+    weights = array('d', csr.weights)
+    for u in range(n):
+        for e in range(csr.indptr[u], csr.indptr[u + 1]):
+            weights[e] = max(0.0, weights[e] + h[u] - h[csr.indices[e]])
+
+    ids = list(range(n)) if sources is None else [csr.index[s] for s in sources]
+    workers = workers or os.cpu_count() or 1
+    batch = batch or max(1, min(64, len(ids) // (workers * 4) or 1))
+    batches = [ids[i:i + batch] for i in range(0, len(ids), batch)]
+    initargs = (csr.indptr, csr.indices, weights, h)
+
+    def _rows():
+        context = _fork_context()
+        if workers == 1 or len(batches) < 2 or context is None:
+            state = (CSRGraph(*initargs[:3], range(n)), h)
+            for b in batches:
+                yield from _johnson_rows(b, state)
+            return
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=_johnson_init, initargs=initargs) as pool:
+            pending = deque()
+            for b in batches:
+                pending.append(pool.submit(_johnson_rows, b))
+                if len(pending) >= 2 * workers:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+    if stream:
+        return ((csr.labels[s], row) for s, row in zip(ids, _rows()))
+    return csr.labels, list(_rows())
+
+
 # ------------------------------------------------------------
 # BFS (Breadth-First Search) su grafo NON pesato
 # ------------------------------------------------------------
-def bfs(graph_simple, start):
+def bfs(graph_simple, start, direction_optimizing=False):
     """
     graph_simple: dict[str, list[str]]  adiacenze (non pesate)
     start: nodo sorgente
+    direction_optimizing: se True usa bfs_direction_optimizing (grafi grandi a
+                          diametro piccolo); l'ordine dentro un livello può cambiare
     Ritorna:
       order: lista in ordine di visita
       parent: dict nodo -> padre nell'albero BFS (per cammini minimi in numero di archi)
     Complessità: O(V + E)
+    Con un CSRGraph: order e parent array('l') di id (parent[start] = start, -1 = non visitato).
     """
+    if direction_optimizing:
+        return bfs_direction_optimizing(graph_simple, start)
+    if isinstance(graph_simple, CSRGraph):
+        return _bfs_csr(graph_simple, start)
+
     visited = set([start])
     parent = {start: None}
     order = []
@@ -203,7 +1063,7 @@ def bfs(graph_simple, start):
 
 
 # ------------------------------------------------------------
-# DFS (Depth-First Search) ricorsiva su grafo NON pesato
+# DFS (Depth-First Search) iterativa su grafo NON pesato
 # ------------------------------------------------------------
 def dfs(graph_simple, start):
     """
@@ -213,23 +1073,899 @@ def dfs(graph_simple, start):
       order: lista in ordine di visita (preorder)
       parent: dict nodo -> padre nell'albero DFS
     Complessità: O(V + E)
+    Stack esplicito di (nodo, iteratore sui vicini): stesso preorder della
+    versione ricorsiva, ma nessun limite di ricorsione su cammini lunghi.
+    Con un CSRGraph: come bfs (array di id).
     """
-    visited = set()
+    if isinstance(graph_simple, CSRGraph):
+        return _dfs_csr(graph_simple, start)
+
+    visited = {start}
     parent = {start: None}
-    order = []
+    order = [start]
 
-    def _visit(u):
-        visited.add(u)
-        order.append(u)
-        for v in graph_simple.get(u, []):
+    stack = [(start, iter(graph_simple.get(start, [])))]
+    while stack:
+        u, nbrs = stack[-1]
+        for v in nbrs:
             if v not in visited:
+                visited.add(v)
                 parent[v] = u
-                _visit(v)
+                order.append(v)
+                stack.append((v, iter(graph_simple.get(v, []))))
+                break
+        else:
+            stack.pop()   # vicini esauriti: si torna al padre
+    return order, parent
 
-    _visit(start)
+
+# ------------------------------------------------------------
+# VISITE IN STREAMING (generatori): BFS con distanze, eventi DFS,
+# ordine topologico
+# ------------------------------------------------------------
+def _traversal(graph_simple, start):
+    """
+    Adatta dict di liste (o di dict) e CSRGraph alle visite generiche.
+    Ritorna (adj, visit, s): adj(u) = vicini di u, visit(v) = True se v non era
+    ancora visitato (e lo marca), s = start come id (CSR) o etichetta.
+    Con CSR i visitati stanno in un bytearray (1 byte per nodo), altrimenti in un set.
+    """
+    if isinstance(graph_simple, CSRGraph):
+        indptr, indices = graph_simple.indptr, graph_simple.indices
+        seen = bytearray(graph_simple.n)
+
+        def visit(v):
+            if seen[v]:
+                return False
+            seen[v] = 1
+            return True
+
+        s = graph_simple.index[start] if start is not None else None
+        return (lambda u: indices[indptr[u]:indptr[u + 1]]), visit, s
+
+    seen = set()
+
+    def visit(v):
+        if v in seen:
+            return False
+        seen.add(v)
+        return True
+
+    return (lambda u: graph_simple.get(u, ())), visit, start
+
+
+def bfs_iter(graph_simple, start):
+    """
+    BFS come generatore: produce (nodo, distanza in archi da start) nello stesso
+    ordine di bfs, un livello alla volta. Il chiamante può fermarsi quando vuole
+    (es. al primo nodo cercato o oltre una certa distanza) senza che l'intero
+    ordine venga mai costruito. Con un CSRGraph i nodi sono id.
+    """
+    adj, visit, s = _traversal(graph_simple, start)
+    visit(s)
+    frontier = [s]
+    hops = 0
+    while frontier:
+        next_frontier = []
+        for u in frontier:
+            yield u, hops
+            for v in adj(u):
+                if visit(v):
+                    next_frontier.append(v)
+        frontier = next_frontier
+        hops += 1
+
+
+def _dfs_events(adj, roots, visit):
+    """ Eventi ("pre", u) all'ingresso e ("post", u) all'uscita, da ogni radice non visitata. """
+    for root in roots:
+        if not visit(root):
+            continue
+        yield "pre", root
+        stack = [(root, iter(adj(root)))]
+        while stack:
+            u, nbrs = stack[-1]
+            for v in nbrs:
+                if visit(v):
+                    yield "pre", v
+                    stack.append((v, iter(adj(v))))
+                    break
+            else:
+                stack.pop()
+                yield "post", u
+
+
+def dfs_events(graph_simple, start):
+    """
+    DFS iterativa come generatore di eventi ("pre", nodo) / ("post", nodo):
+    "pre" segue il preorder di dfs, "post" arriva quando tutti i discendenti
+    sono chiusi (postorder). Utile per raggiungibilità con uscita anticipata,
+    tempi di apertura/chiusura, componenti. Con un CSRGraph i nodi sono id.
+    """
+    adj, visit, s = _traversal(graph_simple, start)
+    return _dfs_events(adj, [s], visit)
+
+
+def dfs_iter(graph_simple, start):
+    """ Nodi raggiungibili da start, in streaming, nel preorder di dfs. """
+    return (u for event, u in dfs_events(graph_simple, start) if event == "pre")
+
+
+def topological_order(graph_simple):
+    """
+    Ordine topologico di un DAG: postorder DFS (su tutte le radici) invertito.
+    Se resta un arco u -> v con v prima di u, il grafo ha un ciclo: ValueError.
+    Con un CSRGraph ritorna un array('l') di id.
+    Complessità: O(V + E), senza ricorsione.
+    """
+    adj, visit, _ = _traversal(graph_simple, None)
+    is_csr = isinstance(graph_simple, CSRGraph)
+    # i nodi solo di arrivo sono raggiunti dai loro predecessori
+    roots = range(graph_simple.n) if is_csr else list(graph_simple)
+    order = [u for event, u in _dfs_events(adj, roots, visit) if event == "post"]
+    order.reverse()
+
+    if is_csr:
+        pos = array('l', [0]) * graph_simple.n
+        for i, u in enumerate(order):
+            pos[u] = i
+    else:
+        pos = {u: i for i, u in enumerate(order)}
+    for u in order:
+        for v in adj(u):
+            if pos[v] <= pos[u]:
+                raise ValueError("Il grafo contiene un ciclo: nessun ordine topologico.")
+    return array('l', order) if is_csr else order
+
+
+# ------------------------------------------------------------
+# GRAFO VERSIONATO E CACHE DEI CAMMINI MINIMI
+# ------------------------------------------------------------
+class Graph(Mapping):
+    """
+    Wrapper del formato dict di dict con numero di versione.
+    Si legge come il dict originale (graph[u][v], graph.get(u, {}), ...), quindi
+    va bene per dijkstra & co.; le adiacenze sono esposte in sola lettura e
+    si modificano solo con add_edge / remove_edge / remove_node, che:
+      - incrementano self.version,
+      - avvisano gli osservatori (subscribe) con (u, v, peso_vecchio, peso_nuovo),
+        None = arco assente; remove_node, dopo aver rimosso gli archi, avvisa
+        con (u, None, None, None).
+    Se un osservatore rifiuta una modifica d'arco (eccezione, es. ValueError per
+    un peso negativo) l'arco torna com'era e l'eccezione risale al chiamante.
+    Mantiene anche le adiacenze entranti (in_edges), utili a chi deve
+    ragionare sui predecessori di un nodo.
+    """
+    def __init__(self, graph=None):
+        self._adj = {}
+        self._radj = {}
+        self.version = 0
+        self._observers = []
+        for u, nbrs in (graph or {}).items():
+            self.add_node(u)
+            for v, w in nbrs.items():
+                self._set(u, v, w)
+
+    # --- lettura (Mapping) ---
+    def __getitem__(self, u):
+        return MappingProxyType(self._adj[u])
+
+    def __iter__(self):
+        return iter(self._adj)
+
+    def __len__(self):
+        return len(self._adj)
+
+    def in_edges(self, v):
+        """ Archi entranti in v: dict (sola lettura) u -> peso. """
+        return MappingProxyType(self._radj[v])
+
+    def to_dict(self):
+        return {u: dict(nbrs) for u, nbrs in self._adj.items()}
+
+    # --- modifica ---
+    def subscribe(self, callback):
+        """ callback(u, v, old_w, new_w) dopo ogni modifica di un arco. """
+        self._observers.append(callback)
+
+    def unsubscribe(self, callback):
+        self._observers.remove(callback)
+
+    def add_node(self, u):
+        if u not in self._adj:
+            self._adj[u] = {}
+            self._radj[u] = {}
+
+    def _set(self, u, v, w):
+        self.add_node(u)
+        self.add_node(v)
+        old = self._adj[u].get(v)
+        self._adj[u][v] = w
+        self._radj[v][u] = w
+        return old
+
+    def _notify(self, u, v, old, new):
+        self.version += 1
+        try:
+            for callback in self._observers:
+                callback(u, v, old, new)
+        except Exception:
+            # modifica rifiutata: si ripristina l'arco; la nuova versione fa
+            # ricalcolare chi aveva già accettato la modifica
+            if old is None:
+                del self._adj[u][v], self._radj[v][u]
+            else:
+                self._adj[u][v] = self._radj[v][u] = old
+            self.version += 1
+            raise
+
+    def add_edge(self, u, v, w):
+        """ Inserisce l'arco u -> v o ne cambia il peso. """
+        old = self._set(u, v, w)
+        if old != w:
+            self._notify(u, v, old, w)
+
+    def remove_edge(self, u, v):
+        old = self._adj[u].pop(v)
+        del self._radj[v][u]
+        self._notify(u, v, old, None)
+
+    def remove_node(self, u):
+        for v in list(self._adj[u]):
+            self.remove_edge(u, v)
+        for x in list(self._radj[u]):
+            self.remove_edge(x, u)
+        del self._adj[u], self._radj[u]
+        self.version += 1
+        for callback in self._observers:
+            callback(u, None, None, None)
+
+
+class ShortestPathCache:
+    """
+    Cache LRU dei risultati di dijkstra su un Graph: (source, version) -> (dist, prev).
+    Invalidazione selettiva: a ogni modifica di u -> v la cache guarda ogni voce
+      - peso aumentato o arco rimosso: la voce cade solo se l'arco è nell'albero
+        dei cammini minimi (prev[v] == u), altrimenti nessuna distanza cambia;
+      - peso diminuito o arco nuovo: la voce cade solo se dist[u] + w < dist[v];
+    le voci non toccate passano alla nuova versione senza ricalcolo.
+    Un nodo nuovo non raggiungibile viene aggiunto alle voci come inf / None,
+    come farebbe un dijkstra da capo.
+    Budget di memoria: tabelle di dist e prev (sys.getsizeof) più un float per
+    ogni distanza (le etichette dei nodi sono condivise con il grafo); oltre
+    max_bytes si scartano le voci meno usate.
+    dist e prev restituiti sono quelli in cache: vanno trattati in sola lettura.
+    """
+    def __init__(self, graph, max_bytes=64 * 2**20):
+        self.graph = graph
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()   # source -> (version, dist, prev, size)
+        self._bytes = 0
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+        graph.subscribe(self._on_edge_change)
+
+    def shortest_paths(self, source):
+        """ (dist, prev) di dijkstra(graph, source), dalla cache se valida. """
+        entry = self._entries.get(source)
+        if entry is not None and entry[0] == self.graph.version:
+            self._entries.move_to_end(source)
+            self.hits += 1
+            return entry[1], entry[2]
+        if entry is not None:
+            self._drop(source)
+
+        self.misses += 1
+        dist, prev = dijkstra(self.graph, source)
+        size = self._size(dist, prev)
+        if size <= self.max_bytes:
+            self._entries[source] = (self.graph.version, dist, prev, size)
+            self._bytes += size
+            self._enforce_budget()
+        return dist, prev
+
+    @staticmethod
+    def _size(dist, prev):
+        return (sys.getsizeof(dist) + sys.getsizeof(prev)
+                + len(dist) * sys.getsizeof(0.0))
+
+    def _enforce_budget(self):
+        while self._bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _drop(self, source):
+        self._bytes -= self._entries.pop(source)[3]
+
+    def _on_edge_change(self, u, v, old_w, new_w):
+        version = self.graph.version
+        if v is None:
+            # nodo u rimosso (senza più archi): sparisce dalle voci, e la sua
+            # voce come sorgente non vale più
+            if u in self._entries:
+                self._drop(u)
+                self.invalidations += 1
+            for source, (_, dist, prev, size) in list(self._entries.items()):
+                dist.pop(u, None)
+                prev.pop(u, None)
+                new_size = self._size(dist, prev)
+                self._bytes += new_size - size
+                self._entries[source] = (version, dist, prev, new_size)
+            return
+        for source, (_, dist, prev, size) in list(self._entries.items()):
+            du = dist.get(u, math.inf)
+            if old_w is not None and (new_w is None or new_w > old_w):
+                affected = prev.get(v) == u
+            else:
+                affected = du + new_w < dist.get(v, math.inf)
+            if affected:
+                self._drop(source)
+                self.invalidations += 1
+                continue
+            for x in (u, v):
+                if x not in dist:   # nodo nuovo, non raggiungibile da source
+                    dist[x] = math.inf
+                    prev[x] = None
+            new_size = self._size(dist, prev)
+            self._bytes += new_size - size
+            self._entries[source] = (version, dist, prev, new_size)
+        self._enforce_budget()
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "invalidations": self.invalidations,
+                "entries": len(self._entries), "bytes": self._bytes}
+
+
+# ------------------------------------------------------------
+# SSSP DINAMICO: riparazione incrementale dell'albero dei cammini minimi
+# ------------------------------------------------------------
+class DynamicSSSP:
+    """
+    dist/prev da una sorgente su un Graph, mantenuti aggiornati a ogni modifica
+    di arco (osservatore del Graph) riparando solo la parte coinvolta, nello
+    spirito di Ramalingam–Reps:
+      - arco nuovo o peso diminuito u -> v: se dist[u] + w < dist[v], v migliora
+        e il miglioramento si propaga con un Dijkstra che parte da v e tocca solo
+        i nodi la cui distanza scende;
+      - arco rimosso o peso aumentato: se u -> v non è nell'albero non cambia
+        nulla; altrimenti il sottoalbero di v (figli in self.children) perde la
+        distanza, ogni suo nodo riparte dal miglior predecessore esterno al
+        sottoalbero (adiacenze entranti del Graph) e un Dijkstra limitato al
+        sottoalbero completa la riparazione.
+    Costo: proporzionale ai nodi coinvolti e ai loro archi, non all'intero grafo.
+    stats: "updates" (modifiche ricevute), "touched" (nodi ricalcolati in totale).
+    """
+    def __init__(self, graph, source):
+        self.graph = graph
+        self.source = source
+        self.dist, self.prev = dijkstra(graph, source)
+        self.children = defaultdict(set)
+        for v, u in self.prev.items():
+            if u is not None:
+                self.children[u].add(v)
+        self.stats = {"updates": 0, "touched": 0}
+        graph.subscribe(self._on_edge_change)
+
+    def close(self):
+        """ Smette di seguire le modifiche del grafo. """
+        self.graph.unsubscribe(self._on_edge_change)
+
+    def path(self, target):
+        return reconstruct_path(self.prev, self.source, target)
+
+    def _set_parent(self, v, u):
+        old = self.prev.get(v)
+        if old is not None:
+            self.children[old].discard(v)
+        self.prev[v] = u
+        if u is not None:
+            self.children[u].add(v)
+
+    def _propagate(self, pq):
+        """ Dijkstra a partire dai nodi in pq (già con la distanza aggiornata). """
+        dist, graph = self.dist, self.graph
+        while pq:
+            d, x = heapq.heappop(pq)
+            if d > dist[x]:
+                continue
+            self.stats["touched"] += 1
+            for y, w in graph[x].items():
+                nd = d + w
+                if nd < dist.get(y, math.inf):
+                    dist[y] = nd
+                    self._set_parent(y, x)
+                    heapq.heappush(pq, (nd, y))
+
+    def _on_edge_change(self, u, v, old_w, new_w):
+        if v is None:
+            # nodo rimosso: i suoi archi sono già stati tolti (dist = inf)
+            self.dist.pop(u, None)
+            self._set_parent(u, None)
+            self.prev.pop(u, None)
+            self.children.pop(u, None)
+            return
+        if new_w is not None and new_w < 0:
+            raise ValueError("DynamicSSSP richiede pesi non negativi.")
+        self.stats["updates"] += 1
+        dist = self.dist
+        if old_w is None or (new_w is not None and new_w < old_w):
+            # nodi nuovi del grafo: stesse chiavi di dijkstra(graph, source)
+            for x in (u, v):
+                if x not in dist:
+                    dist[x] = math.inf
+                    self.prev[x] = None
+            # inserimento / diminuzione: solo miglioramenti possibili
+            nd = dist[u] + new_w
+            if nd < dist[v]:
+                dist[v] = nd
+                self._set_parent(v, u)
+                self._propagate([(nd, v)])
+            return
+
+        if self.prev.get(v) != u:
+            return   # arco fuori dall'albero: nessuna distanza cambia
+
+        # rimozione / aumento di un arco dell'albero: sottoalbero di v
+        affected = [v]
+        for x in affected:
+            affected.extend(self.children[x])
+        in_subtree = set(affected)
+        for x in affected:
+            dist[x] = math.inf
+        pq = []
+        for x in affected:
+            best, parent = math.inf, None
+            for p, w in self.graph.in_edges(x).items():
+                dp = dist.get(p, math.inf)
+                if p not in in_subtree and dp + w < best:
+                    best, parent = dp + w, p
+            self._set_parent(x, parent)
+            if parent is not None:
+                dist[x] = best
+                pq.append((best, x))
+        heapq.heapify(pq)
+        self._propagate(pq)
+
+
+def benchmark_dynamic_sssp(n_nodes=20_000, avg_degree=6, updates=200, full_runs=10, seed=0):
+    """
+    Perturbazioni casuali piccole (pesi x0.5..x2, rimozioni, inserimenti) su un
+    grafo casuale: tempo medio di riparazione di DynamicSSSP contro un dijkstra
+    completo (misurato su full_runs esecuzioni). Alla fine verifica che le
+    distanze riparate coincidano con quelle ricalcolate da zero.
+    """
+    rng = random.Random(seed)
+    graph = Graph()
+    for u, v, w in random_edge_list(n_nodes, avg_degree, seed):
+        graph.add_edge(u, v, w)
+    nodes = list(graph)
+    source = nodes[0]
+    sssp = DynamicSSSP(graph, source)
+
+    t0 = time.perf_counter()
+    for _ in range(updates):
+        u = rng.choice(nodes)
+        r = rng.random()
+        if r < 0.6 and graph[u]:
+            v = rng.choice(list(graph[u]))
+            graph.add_edge(u, v, graph[u][v] * rng.uniform(0.5, 2.0))
+        elif r < 0.8 and graph[u]:
+            graph.remove_edge(u, rng.choice(list(graph[u])))
+        else:
+            graph.add_edge(u, rng.choice(nodes), rng.uniform(1.0, 10.0))
+    repair = (time.perf_counter() - t0) / updates
+
+    t0 = time.perf_counter()
+    for _ in range(full_runs):
+        dist, _ = dijkstra(graph, source)
+    full = (time.perf_counter() - t0) / full_runs
+    sssp.close()
+
+    correct = all(abs(dist.get(u, math.inf) - sssp.dist.get(u, math.inf)) < 1e-9
+                  or dist.get(u, math.inf) == sssp.dist.get(u, math.inf) for u in nodes)
+    return {"nodes": n_nodes, "updates": updates,
+            "repair_seconds": repair, "full_seconds": full,
+            "speedup": full / repair if repair else math.inf,
+            "touched_per_update": sssp.stats["touched"] / updates,
+            "correct": correct}
+
+
+# ------------------------------------------------------------
+# GRAFO COMPATTO CSR (Compressed Sparse Row)
+# ------------------------------------------------------------
+class CSRGraph:
+    """
+    Grafo orientato pesato in formato CSR, con nodi numerati 0..n-1:
+      - gli archi uscenti da u sono le posizioni e in [indptr[u], indptr[u+1])
+      - indices[e] = nodo di arrivo, weights[e] = peso dell'arco
+      - labels[i] = etichetta originale del nodo i, index[etichetta] = i
+    Tre array tipizzati al posto di un dict per nodo: 12 byte per arco
+    (id a 32 bit + peso double) e nessun hash a ogni accesso ai vicini.
+    Gli algoritmi ricevono e ritornano etichette per source/start, ma lavorano
+    e restituiscono dist/prev/parent come array indicizzati per id.
+    Gli array vanno trattati in sola lettura: has_negative (esiste un peso < 0)
+    è calcolato una volta qui, non a ogni Dijkstra.
+    """
+    def __init__(self, indptr, indices, weights, labels):
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.labels = list(labels)
+        self.index = {label: i for i, label in enumerate(self.labels)}
+        self.has_negative = len(weights) > 0 and min(weights) < 0
+
+    @property
+    def n(self):
+        return len(self.labels)
+
+    @property
+    def m(self):
+        return len(self.indices)
+
+    @classmethod
+    def from_edge_list(cls, edges, nodes=None):
+        """
+        Costruisce il CSR da archi (u, v) o (u, v, w) (peso di default 1.0).
+        Counting sort degli archi per sorgente: O(V + E).
+        nodes: etichette in ordine di id (default: in ordine di apparizione).
+        """
+        labels = list(nodes) if nodes is not None else []
+        index = {label: i for i, label in enumerate(labels)}
+
+        def _id(label):
+            if label not in index:
+                index[label] = len(labels)
+                labels.append(label)
+            return index[label]
+
+        src = array('l')
+        dst = array('l')
+        wts = array('d')
+        for e in edges:
+            src.append(_id(e[0]))
+            dst.append(_id(e[1]))
+            wts.append(e[2] if len(e) > 2 else 1.0)
+
+        n = len(labels)
+        indptr = array('l', [0]) * (n + 1)
+        for u in src:
+            indptr[u + 1] += 1
+        for u in range(n):
+            indptr[u + 1] += indptr[u]
+
+        pos = array('l', indptr)
+        # id a 32 bit quando bastano: 4 byte per arco invece di 8
+        indices = array('i' if n < 2**31 else 'q', [0]) * len(src)
+        weights = array('d', [0.0]) * len(src)
+        for u, v, w in zip(src, dst, wts):
+            e = pos[u]
+            indices[e] = v
+            weights[e] = w
+            pos[u] = e + 1
+        return cls(indptr, indices, weights, labels)
+
+    @classmethod
+    def from_dict(cls, graph):
+        """
+        Converte dal formato del resto della lezione:
+        dict di dict (pesato) oppure dict di liste (non pesato, peso 1.0).
+        Gli id seguono l'ordine delle chiavi, poi i nodi che compaiono solo come arrivo.
+        """
+        def _edges():
+            for u, nbrs in graph.items():
+                if isinstance(nbrs, Mapping):   # dict, Graph (viste in sola lettura)
+                    for v, w in nbrs.items():
+                        yield (u, v, w)
+                else:
+                    for v in nbrs:
+                        yield (u, v)
+        return cls.from_edge_list(_edges(), nodes=graph.keys())
+
+    def to_dict(self):
+        """ Ritorna il grafo come dict di dict di etichette (formato originale). """
+        labels, indptr, indices, weights = self.labels, self.indptr, self.indices, self.weights
+        return {labels[u]: {labels[indices[e]]: weights[e]
+                            for e in range(indptr[u], indptr[u + 1])}
+                for u in range(self.n)}
+
+    def neighbors(self, u):
+        """ Coppie (v, w) degli archi uscenti dal nodo con id u. """
+        for e in range(self.indptr[u], self.indptr[u + 1]):
+            yield self.indices[e], self.weights[e]
+
+    def transpose(self):
+        """ Grafo con gli archi invertiti (stesse etichette e stessi id). """
+        def _reversed_edges():
+            for u in range(self.n):
+                for e in range(self.indptr[u], self.indptr[u + 1]):
+                    yield (self.labels[self.indices[e]], self.labels[u], self.weights[e])
+        return CSRGraph.from_edge_list(_reversed_edges(), nodes=self.labels)
+
+    def __repr__(self):
+        return f"CSRGraph(n={self.n}, m={self.m})"
+
+
+def _dijkstra_csr(graph, source, target=None):
+    """ Dijkstra su CSRGraph: dist/prev in array, 'settled' in un bytearray. """
+    n = graph.n
+    indptr, indices, weights = graph.indptr, graph.indices, graph.weights
+    if graph.has_negative:
+        raise ValueError("Dijkstra richiede pesi non negativi.")
+
+    s = graph.index[source]
+    t = graph.index[target] if target is not None else -1
+    dist = array('d', [math.inf]) * n
+    prev = array('l', [-1]) * n
+    done = bytearray(n)
+    dist[s] = 0.0
+
+    pq = [(0.0, s)]
+    while pq:
+        d, u = heapq.heappop(pq)
+        if done[u]:
+            continue
+        done[u] = 1
+        if u == t:
+            break
+        for e in range(indptr[u], indptr[u + 1]):
+            v = indices[e]
+            nd = d + weights[e]
+            if nd < dist[v]:
+                dist[v] = nd
+                prev[v] = u
+                heapq.heappush(pq, (nd, v))
+    return dist, prev
+
+
+def _bellman_ford_csr(graph, source):
+    """ Bellman–Ford su CSRGraph: scorre direttamente gli array degli archi. """
+    n = graph.n
+    indptr, indices, weights = graph.indptr, graph.indices, graph.weights
+    dist = array('d', [math.inf]) * n
+    prev = array('l', [-1]) * n
+    dist[graph.index[source]] = 0.0
+
+    for _ in range(n - 1):
+        updated = False
+        for u in range(n):
+            du = dist[u]
+            if du == math.inf:
+                continue
+            for e in range(indptr[u], indptr[u + 1]):
+                v = indices[e]
+                if du + weights[e] < dist[v]:
+                    dist[v] = du + weights[e]
+                    prev[v] = u
+                    updated = True
+        if not updated:
+            break
+
+    has_negative_cycle = any(
+        dist[u] != math.inf and dist[u] + weights[e] < dist[indices[e]]
+        for u in range(n) for e in range(indptr[u], indptr[u + 1]))
+    return dist, prev, has_negative_cycle
+
+
+def _floyd_warshall_csr(graph):
+    """ Floyd–Warshall su CSRGraph: matrice come lista di righe array('d') / array('l'). """
+    n = graph.n
+    dist = [array('d', [math.inf]) * n for _ in range(n)]
+    nxt = [array('l', [-1]) * n for _ in range(n)]
+    for u in range(n):
+        dist[u][u] = 0.0
+        nxt[u][u] = u
+        for v, w in graph.neighbors(u):
+            if w < dist[u][v]:
+                dist[u][v] = w
+                nxt[u][v] = v
+
+    for k in range(n):
+        dk = dist[k]
+        for i in range(n):
+            di = dist[i]
+            dik = di[k]
+            if dik == math.inf:
+                continue
+            ni = nxt[i]
+            nik = ni[k]
+            for j in range(n):
+                nd = dik + dk[j]   # inf + x = inf: nessun controllo esplicito
+                if nd < di[j]:
+                    di[j] = nd
+                    ni[j] = nik
+    return dist, nxt
+
+
+def _bfs_csr(graph, start):
+    """ BFS su CSRGraph: 'order' fa anche da coda (puntatore di testa). """
+    indptr, indices = graph.indptr, graph.indices
+    s = graph.index[start]
+    parent = array('l', [-1]) * graph.n
+    parent[s] = s
+    order = array('l', [s])
+    head = 0
+    while head < len(order):
+        u = order[head]
+        head += 1
+        for e in range(indptr[u], indptr[u + 1]):
+            v = indices[e]
+            if parent[v] == -1:
+                parent[v] = u
+                order.append(v)
+    return order, parent
+
+
+def bfs_direction_optimizing(graph, start, alpha=14, beta=24, transpose=None, stats=None):
+    """
+    BFS "direction-optimizing" (Beamer): a ogni livello sceglie fra
+      - top-down: i nodi della frontiera scorrono i propri archi uscenti;
+      - bottom-up: ogni nodo non visitato scorre i propri archi entranti
+        (grafo trasposto) e si ferma al primo padre che sta nella frontiera.
+    Quando la frontiera contiene gran parte del grafo, il bottom-up controlla
+    molti meno archi. Si passa a bottom-up se gli archi uscenti dalla frontiera
+    superano (archi entranti dei non visitati) / alpha, e si torna a top-down
+    quando la frontiera scende sotto n / beta nodi.
+    Visitati e frontiera bottom-up sono bitset bytearray (1 byte per nodo);
+    visited.find(0) salta in C i nodi già visitati.
+    graph: CSRGraph (un dict viene convertito)
+    transpose: graph.transpose() già calcolato, da riusare fra più visite
+    stats: dict opzionale, riceve "levels" (direzione per livello) e "edges" (archi controllati)
+    Ritorna (order, parent) come bfs: stessi livelli e albero BFS valido, ma
+    dentro un livello bottom-up l'ordine è per id crescente.
+    """
+    if not isinstance(graph, CSRGraph):
+        csr = CSRGraph.from_dict(graph)
+        order, parent = bfs_direction_optimizing(csr, start, alpha, beta, stats=stats)
+        labels = csr.labels
+        return ([labels[u] for u in order],
+                {labels[v]: (labels[p] if v != p else None)
+                 for v, p in enumerate(parent) if p != -1})
+
+    rev = transpose if transpose is not None else graph.transpose()
+    n = graph.n
+    indptr, indices = graph.indptr, graph.indices
+    rptr, rind = rev.indptr, rev.indices
+
+    s = graph.index[start]
+    parent = array('l', [-1]) * n
+    parent[s] = s
+    visited = bytearray(n)
+    visited[s] = 1
+    order = array('l', [s])
+    frontier = array('l', [s])
+    unvisited_edges = rev.m - (rptr[s + 1] - rptr[s])   # archi entranti dei non visitati
+    top_down = True
+    levels = []
+    edges = 0
+
+    while frontier:
+        if top_down:
+            frontier_edges = sum(indptr[u + 1] - indptr[u] for u in frontier)
+            top_down = frontier_edges <= unvisited_edges / alpha
+        else:
+            top_down = len(frontier) < n / beta
+        levels.append("top-down" if top_down else "bottom-up")
+
+        next_frontier = array('l')
+        if top_down:
+            for u in frontier:
+                for e in range(indptr[u], indptr[u + 1]):
+                    v = indices[e]
+                    if not visited[v]:
+                        visited[v] = 1
+                        parent[v] = u
+                        next_frontier.append(v)
+                edges += indptr[u + 1] - indptr[u]
+        else:
+            in_frontier = bytearray(n)
+            for u in frontier:
+                in_frontier[u] = 1
+            v = visited.find(0)
+            while v != -1:
+                for e in range(rptr[v], rptr[v + 1]):
+                    u = rind[e]
+                    if in_frontier[u]:
+                        parent[v] = u
+                        next_frontier.append(v)
+                        edges += e - rptr[v] + 1
+                        break
+                else:
+                    edges += rptr[v + 1] - rptr[v]
+                v = visited.find(0, v + 1)
+            for v in next_frontier:
+                visited[v] = 1
+
+        for v in next_frontier:
+            unvisited_edges -= rptr[v + 1] - rptr[v]
+        order.extend(next_frontier)
+        frontier = next_frontier
+
+    if stats is not None:
+        stats["levels"] = levels
+        stats["edges"] = edges
+    return order, parent
+
+def _dfs_csr(graph, start):
+    """
+    DFS iterativa su CSRGraph, stesso preorder della versione su dict:
+    per ogni nodo sullo stack si ricorda il prossimo arco da esplorare.
+    """
+    indptr, indices = graph.indptr, graph.indices
+    s = graph.index[start]
+    parent = array('l', [-1]) * graph.n
+    parent[s] = s
+    order = array('l', [s])
+    stack_u = [s]
+    stack_e = [indptr[s]]
+    while stack_u:
+        u = stack_u[-1]
+        e = stack_e[-1]
+        if e < indptr[u + 1]:
+            stack_e[-1] = e + 1
+            v = indices[e]
+            if parent[v] == -1:
+                parent[v] = u
+                order.append(v)
+                stack_u.append(v)
+                stack_e.append(indptr[v])
+        else:
+            stack_u.pop()
+            stack_e.pop()
     return order, parent
 
 
+def random_edge_list(n_nodes, avg_degree, seed=0, max_weight=10.0):
+    """ Archi casuali (u, v, w) tra nodi 'n0'..'n{n-1}', per esempi e benchmark. """
+    rng = random.Random(seed)
+    labels = [f"n{i}" for i in range(n_nodes)]
+    return [(labels[rng.randrange(n_nodes)], labels[rng.randrange(n_nodes)],
+             rng.uniform(1.0, max_weight)) for _ in range(n_nodes * avg_degree)]
+
+
+def benchmark_csr(n_nodes=100_000, avg_degree=8, seed=0):
+    """
+    Confronta dict di dict e CSRGraph sullo stesso grafo casuale:
+    memoria allocata per la rappresentazione (tracemalloc) e tempo di dijkstra/bfs.
+    Ritorna un dict con i valori misurati e i rapporti dict/CSR.
+    """
+    edges = random_edge_list(n_nodes, avg_degree, seed)
+
+    tracemalloc.start()
+    as_dict = {}
+    for u, v, w in edges:
+        as_dict.setdefault(u, {})[v] = w
+        as_dict.setdefault(v, {})
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    as_csr = CSRGraph.from_edge_list(edges)
+    csr_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    source = edges[0][0]
+    simple = {u: list(nbrs) for u, nbrs in as_dict.items()}
+    timings = {}
+    for name, fn, graph in (("dijkstra_dict", dijkstra, as_dict),
+                            ("dijkstra_csr", dijkstra, as_csr),
+                            ("bfs_dict", bfs, simple),
+                            ("bfs_csr", bfs, as_csr)):
+        t0 = time.perf_counter()
+        fn(graph, source)
+        timings[name] = time.perf_counter() - t0
+
+    return {"nodes": n_nodes, "edges": as_csr.m,
+            "dict_bytes": dict_bytes, "csr_bytes": csr_bytes,
+            "memory_ratio": dict_bytes / csr_bytes,
+            **timings,
+            "dijkstra_speedup": timings["dijkstra_dict"] / timings["dijkstra_csr"],
+            "bfs_speedup": timings["bfs_dict"] / timings["bfs_csr"]}
+
+
 # ------------------------------------------------------------
 # ESEMPI D'USO RAPIDI
 # ------------------------------------------------------------
@@ -246,14 +1982,55 @@ if __name__ == "__main__":
     # Dijkstra (pesi non negativi)
     dist_dij, prev_dij = dijkstra(G, 'A')
     print("Dijkstra distanze:", dist_dij)
+    dist_ae, prev_ae = dijkstra(G, 'A', target='E')
+    print("Dijkstra A->E:", dist_ae['E'], "path:", reconstruct_path(prev_ae, 'A', 'E'))
+    print("Dijkstra bidirezionale A->E:", bidirectional_dijkstra(G, 'A', 'E'))
+    alt = ALTLandmarks.preprocess(G, k=2)
+    print("A* (ALT, landmark", alt.landmarks, ") A->E:", astar(G, 'A', 'E', alt))
+    ch = ContractionHierarchy.build(G)
+    print("Contraction Hierarchies A->E:", ch.query('A', 'E'), "scorciatoie:", ch.num_shortcuts)
 
     # Bellman–Ford (supporta pesi negativi)
     dist_bf, prev_bf, neg_cycle = bellman_ford(G, 'A')
     print("Bellman-Ford distanze:", dist_bf, "ciclo negativo:", neg_cycle)
+    G_neg = {'A': {'B': 1.0}, 'B': {'C': -2.0}, 'C': {'A': 0.5, 'D': 1.0}}
+    print("SPFA ciclo negativo:", spfa(G_neg, 'A')[2])
+
+    # Grafo versionato + cache dei cammini minimi
+    VG = Graph(G)
+    cache = ShortestPathCache(VG)
+    cache.shortest_paths('A'); cache.shortest_paths('A')
+    VG.add_edge('C', 'E', 100.0)   # arco nuovo ma inutile: la voce resta valida
+    cache.shortest_paths('A')
+    VG.add_edge('A', 'E', 1.0)     # scorciatoia: la voce viene invalidata
+    print("Cache A->E:", cache.shortest_paths('A')[0]['E'], cache.stats())
+    # un Graph vale come dict di dict anche per gli algoritmi che passano dal CSR
+    labels_v, rows_v = johnson_all_pairs(VG, workers=1)
+    labels_f, dist_f, _ = floyd_warshall_matrix(VG)
+    dist_v, _ = dijkstra(VG, 'A')
+    a_v, a_f = labels_v.index('A'), labels_f.index('A')
+    assert all(rows_v[a_v][labels_v.index(u)] == dist_f[a_f][labels_f.index(u)] == d
+               for u, d in dist_v.items())
+    print("Johnson e Floyd–Warshall su Graph A->D:", rows_v[a_v][labels_v.index('D')])
+    sssp = DynamicSSSP(VG, 'A')
+    VG.remove_edge('A', 'E')      # arco dell'albero: si ripara il sottoalbero di E
+    print("SSSP dinamico A->E:", sssp.dist['E'], sssp.path('E'), sssp.stats)
+    VG.add_edge('X', 'E', 1.0)     # predecessore nuovo e irraggiungibile da A
+    VG.add_edge('D', 'E', 5.0)     # aumento su un arco dell'albero: X non va usato
+    print("SSSP dinamico con nodo irraggiungibile:", sssp.dist['E'], sssp.dist['X'], sssp.prev['X'])
 
     # Floyd–Warshall (tutte le coppie)
     dist_fw, nxt_fw = floyd_warshall(G)
     print("Floyd–Warshall A->E:", dist_fw['A']['E'], "path:", reconstruct_path_fw(nxt_fw, 'A', 'E'))
+    labels_m, dist_m, nxt_m = floyd_warshall_matrix(G)
+    a, e = labels_m.index('A'), labels_m.index('E')
+    print("Floyd–Warshall matrice A->E:", float(dist_m[a][e]),
+          "path:", [labels_m[i] for i in reconstruct_path_fw(nxt_m, a, e)],
+          "cicli negativi:", fw_negative_cycle_nodes(dist_m))
+
+    # Johnson (tutte le coppie, grafi sparsi)
+    labels_j, rows_j = johnson_all_pairs(G, workers=2)
+    print("Johnson A->E:", rows_j[labels_j.index('A')][labels_j.index('E')])
 
     # Grafo non pesato per BFS/DFS
     GU = {
@@ -269,3 +2046,17 @@ if __name__ == "__main__":
 
     order_dfs, parent_dfs = dfs(GU, 'A')
     print("DFS order:", order_dfs)
+    print("BFS con distanze:", list(bfs_iter(GU, 'A')))
+    print("DFS eventi:", list(dfs_events(GU, 'A')))
+    print("Ordine topologico:", topological_order({'lib': ['app', 'test'], 'core': ['lib'], 'app': ['test']}))
+
+    # Stesso grafo in formato CSR: risultati indicizzati per id
+    C = CSRGraph.from_dict(G)
+    dist_csr, prev_csr = dijkstra(C, 'A')
+    print("Dijkstra CSR:", {C.labels[i]: d for i, d in enumerate(dist_csr)})
+    CU = CSRGraph.from_dict(GU)
+    order_csr, _ = bfs(CU, 'A')
+    print("BFS CSR order:", [CU.labels[i] for i in order_csr])
+    levels = {}
+    order_do, _ = bfs_direction_optimizing(CU, 'A', stats=levels)
+    print("BFS direction-optimizing:", [CU.labels[i] for i in order_do], levels["levels"])